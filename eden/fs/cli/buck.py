@@ -6,16 +6,17 @@
 
 # pyre-strict
 
+import concurrent.futures
 import errno
-import glob
+import functools
 import os
 import subprocess
 import sys
 from subprocess import CalledProcessError
-from typing import Dict, List
+from typing import Callable, Dict, List, Tuple
 
 from . import proc_utils
-from .util import get_environment_suitable_for_subprocess
+from .util import get_environment_suitable_for_subprocess, read_pid_file
 
 # In the EdenFS buck integration tests we build buck from source
 # in these tests we need to use the source built buck. The path for
@@ -25,6 +26,19 @@ def get_buck_command() -> str:
     return os.environ.get("SOURCE_BUILT_BUCK", "buck")
 
 
+@functools.lru_cache(maxsize=None)
+def _get_buck_version_fast(path: str) -> str:
+    # Asking buck for its version means starting a JVM, and redirect fixup can
+    # stop buck in the same project several times, so only ask once per
+    # project.
+    return subprocess.run(
+        [get_buck_command(), "--version-fast"],
+        stdout=subprocess.PIPE,
+        cwd=path,
+        encoding="utf-8",
+    ).stdout.strip()
+
+
 def get_env_with_buck_version(path: str) -> Dict[str, str]:
     env = get_environment_suitable_for_subprocess()
     if os.environ.get("SOURCE_BUILT_BUCK") is not None:
@@ -41,12 +55,7 @@ def get_env_with_buck_version(path: str) -> Dict[str, str]:
     if sys.platform != "win32":
         buckversion = "last"
     else:
-        buckversion = subprocess.run(
-            [get_buck_command(), "--version-fast"],
-            stdout=subprocess.PIPE,
-            cwd=path,
-            encoding="utf-8",
-        ).stdout.strip()
+        buckversion = _get_buck_version_fast(path)
 
     env["BUCKVERSION"] = buckversion
 
@@ -58,10 +67,19 @@ def find_buck_projects_in_repo(path: str) -> List[str]:
     # buck project locations in our repos.
     # While fbsource has a top level buckconfig, we don't really use
     # it in our projects today.  Instead, our projects tend to have
-    # their own configuration files one level down.  This glob()
-    # finds those directories for us.
-    buck_configs = glob.glob(f"{path}/*/.buckconfig")
-    projects = [os.path.dirname(config) for config in buck_configs]
+    # their own configuration files one level down.  Scan the top level
+    # directory once and only probe for .buckconfig in its subdirectories,
+    # skipping hidden entries just as a "*/.buckconfig" glob would.
+    projects = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                if os.path.lexists(os.path.join(entry.path, ".buckconfig")):
+                    projects.append(entry.path)
+    except OSError:
+        pass
     if os.path.isfile(f"{path}/.buckconfig"):
         projects.append(path)
     return projects
@@ -70,8 +88,7 @@ def find_buck_projects_in_repo(path: str) -> List[str]:
 def is_buckd_running_for_path(path: str) -> bool:
     pid_file = os.path.join(path, ".buckd", "pid")
     try:
-        with open(pid_file, "r") as f:
-            buckd_pid = int(f.read().strip())
+        buckd_pid = read_pid_file(pid_file)
     except ValueError:
         return False
     except OSError as exc:
@@ -93,47 +110,121 @@ def is_buckd_running_for_path(path: str) -> bool:
 def run_buck_command(
     buck_command: List[str], path: str
 ) -> "subprocess.CompletedProcess[bytes]":
-
-    env = get_env_with_buck_version(path)
     try:
-        return subprocess.run(
-            buck_command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=path,
-            env=env,
-            check=True,
-        )
+        return _run_buck_command(buck_command, path)
     except CalledProcessError as e:
-        print(
-            f"{e}\n\nFailed to kill buck. Please manually run `buck kill` in `{path}`"
-        )
+        print(_buck_kill_failure_message(e, path))
         raise e
 
 
+def _run_buck_command(
+    buck_command: List[str], path: str
+) -> "subprocess.CompletedProcess[bytes]":
+    env = get_env_with_buck_version(path)
+    return subprocess.run(
+        buck_command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=path,
+        env=env,
+        check=True,
+    )
+
+
+def _buck_kill_failure_message(ex: BaseException, path: str) -> str:
+    return f"{ex}\n\nFailed to kill buck. Please manually run `buck kill` in `{path}`"
+
+
 def stop_buckd_for_path(path: str) -> None:
     print(f"Stopping buck in {path}...")
 
     run_buck_command([get_buck_command(), "kill"], path)
 
 
+def _kill_buckd(path: str) -> None:
+    _run_buck_command([get_buck_command(), "kill"], path)
+
+
+# Every buck kill or clean starts a JVM, so never run more than this many at
+# once, however many repositories and projects are involved.
+_MAX_BUCK_PROCESSES = 8
+
+
+def _run_for_projects(
+    func: Callable[[str], None], projects: List[str]
+) -> List[Tuple[str, BaseException]]:
+    """Call func for each project concurrently.
+
+    Each call is dominated by a buck subprocess starting up, so running them in
+    parallel takes about as long as the slowest project rather than the sum of
+    all of them.  func should not print anything, since its output would be
+    interleaved with the other calls'.  Returns the (project, exception) pairs
+    for the calls that failed, in the order of projects.
+    """
+    if not projects:
+        return []
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(_MAX_BUCK_PROCESSES, len(projects))
+    ) as executor:
+        futures = [(project, executor.submit(func, project)) for project in projects]
+
+    failures = []
+    for project, future in futures:
+        ex = future.exception()
+        if ex is not None:
+            failures.append((project, ex))
+    return failures
+
+
+def find_running_buckd_projects(path: str) -> List[str]:
+    """Find the buck projects in the repo at path that have a buckd running"""
+    return [
+        project
+        for project in find_buck_projects_in_repo(path)
+        if is_buckd_running_for_path(project)
+    ]
+
+
+def stop_buckd_for_projects(projects: List[str]) -> List[Tuple[str, BaseException]]:
+    """Stop buckd in each of the given projects.
+
+    All of the kills share one bounded pool, so callers stopping buckd for
+    several repositories should gather their projects and make a single call.
+    Messages are printed from the calling thread, in the order of projects.
+    Returns the (project, exception) pairs for the projects that failed.
+    """
+    for project in projects:
+        print(f"Stopping buck in {project}...")
+    failures = _run_for_projects(_kill_buckd, projects)
+    for project, ex in failures:
+        print(_buck_kill_failure_message(ex, project))
+    return failures
+
+
 def stop_buckd_for_repo(path: str) -> None:
     """Stop the major buckd instances that are likely to be running for path"""
-    for project in find_buck_projects_in_repo(path):
-        if is_buckd_running_for_path(project):
-            stop_buckd_for_path(project)
+    failures = stop_buckd_for_projects(find_running_buckd_projects(path))
+    if failures:
+        raise failures[0][1]
+
+
+def _buck_clean_project(project: str) -> None:
+    subprocess.run(
+        # Using BUCKVERSION=last here to avoid triggering a download
+        # of a new version of buck just to remove some dirs
+        # This is specific to Facebook's deployment of buck, and has
+        # no impact on the behavior of the opensource buck executable.
+        ["env", "NO_BUCKD=true", "BUCKVERSION=last", get_buck_command(), "clean"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=project,
+    )
 
 
 def buck_clean_repo(path: str) -> None:
-    for project in find_buck_projects_in_repo(path):
+    projects = find_buck_projects_in_repo(path)
+    for project in projects:
         print(f"Cleaning buck in {project}...")
-        subprocess.run(
-            # Using BUCKVERSION=last here to avoid triggering a download
-            # of a new version of buck just to remove some dirs
-            # This is specific to Facebook's deployment of buck, and has
-            # no impact on the behavior of the opensource buck executable.
-            ["env", "NO_BUCKD=true", "BUCKVERSION=last", get_buck_command(), "clean"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            cwd=project,
-        )
+    failures = _run_for_projects(_buck_clean_project, projects)
+    if failures:
+        raise failures[0][1]
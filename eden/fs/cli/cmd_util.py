@@ -8,6 +8,7 @@
 
 import argparse
 import os
+import sys
 from pathlib import Path
 from typing import Optional, Tuple, Union
 
@@ -37,24 +38,58 @@ def find_checkout(
 def require_checkout(
     args: argparse.Namespace, path: Union[Path, str, None]
 ) -> Tuple[EdenInstance, EdenCheckout, Path]:
+    # Only fall back to the current directory when no path was given, and do so
+    # once so the error message below does not need to query it again.
+    if path is None:
+        path = os.getcwd()
     instance, checkout, rel_path = find_checkout(args, path)
     if checkout is None:
-        msg_path = path if path is not None else os.getcwd()
-        raise subcmd_mod.CmdError(f"no EdenFS checkout found at {msg_path}\n")
+        raise subcmd_mod.CmdError(f"no EdenFS checkout found at {path}\n")
     assert rel_path is not None
     return instance, checkout, rel_path
 
 
 def prompt_confirmation(prompt: str) -> bool:
-    # Import readline lazily here because it conflicts with ncurses's resize support.
-    # https://bugs.python.org/issue2675
+    prompt_str = f"{prompt} [y/N] "
+    if sys.platform == "win32" or not sys.stdin.isatty():
+        return _prompt_confirmation_line(prompt_str)
+
+    # Read a single keystroke in cbreak mode rather than a whole line.  This
+    # avoids loading readline, which also conflicts with ncurses's resize
+    # support (https://bugs.python.org/issue2675).
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    old_attrs = termios.tcgetattr(fd)
     try:
-        import readline  # noqa: F401 Importing readline improves the behavior of input()
-    except ImportError:
-        # We don't strictly need readline
-        pass
+        tty.setcbreak(fd)
+        while True:
+            sys.stdout.write(prompt_str)
+            sys.stdout.flush()
+            key = os.read(fd, 1)
+            if key in (b"y", b"Y"):
+                answer = True
+                break
+            # An empty read means stdin was closed; treat it like the default.
+            if key in (b"", b"n", b"N", b"\n", b"\r"):
+                answer = False
+                break
+            # Echo is off, so explain why the key did nothing.  Drop anything
+            # else typed along with it so we only complain once.
+            termios.tcflush(fd, termios.TCIFLUSH)
+            print(key.decode(errors="replace"))
+            print('Please enter "yes" or "no"')
+    finally:
+        # Discard the rest of anything typed ahead (such as the "es" of "yes")
+        # so that it doesn't end up being read by the shell after we exit.
+        termios.tcsetattr(fd, termios.TCSAFLUSH, old_attrs)
 
-    prompt_str = f"{prompt} [y/N] "
+    print("yes" if answer else "no")
+    return answer
+
+
+def _prompt_confirmation_line(prompt_str: str) -> bool:
     while True:
         response = input(prompt_str)
         value = response.lower()
@@ -246,6 +246,7 @@ class EdenInstance(AbstractEdenInstance):
     """
 
     _telemetry_logger: Optional[telemetry.TelemetryLogger] = None
+    _config_parser: Optional[configutil.EdenConfigParser] = None
     _home_dir: Path
     _user_config_path: Path
     _system_config_path: Path
@@ -333,8 +334,15 @@ class EdenInstance(AbstractEdenInstance):
         ${USER} will be replaced by the user's login name.
         These are coupled with the equivalent code in
         eden/fs/config/CheckoutConfig.cpp and must be kept in sync.
+
+        The parsed result is cached for the lifetime of this EdenInstance, since
+        a single CLI command may look up many config values.
         """
-        return self.read_configs(self.get_rc_files())
+        parser = self._config_parser
+        if parser is None:
+            parser = self.read_configs(self.get_rc_files())
+            self._config_parser = parser
+        return parser
 
     @property
     def _config_variables(self) -> Dict[str, str]:
@@ -744,6 +752,16 @@ Do you want to run `eden mount %s` instead?"""
             )
 
     def mount(self, path: Union[Path, str], read_only: bool) -> int:
+        with self.get_thrift_client_legacy() as client:
+            return self.mount_with_client(client, path, read_only)
+
+    def mount_with_client(
+        self, client: legacy.EdenClient, path: Union[Path, str], read_only: bool
+    ) -> int:
+        """Mount the specified checkout using an already-connected thrift client.
+
+        This lets callers mounting several checkouts share a single connection.
+        """
         # Load the config info for this client, to make sure we
         # know about the client.
         path = Path(path).resolve(strict=False)
@@ -797,8 +815,7 @@ Do you want to run `eden mount %s` instead?"""
         )
 
         try:
-            with self.get_thrift_client_legacy() as client:
-                client.mount(mount_info)
+            client.mount(mount_info)
         except eden_ttypes.EdenError as ex:
             if "already mounted" in str(ex):
                 print_stderr(
@@ -818,7 +835,15 @@ Do you want to run `eden mount %s` instead?"""
         # For now at least time out here so the CLI commands do not hang in this
         # case.
         with self.get_thrift_client_legacy(timeout=60) as client:
-            client.unmount(os.fsencode(path))
+            self.unmount_with_client(client, path)
+
+    def unmount_with_client(self, client: legacy.EdenClient, path: str) -> None:
+        """Unmount the specified checkout using an already-connected thrift client.
+
+        The client should have been created with the same 60 second timeout used
+        by unmount().
+        """
+        client.unmount(os.fsencode(path))
 
     def get_handle_path(self) -> Optional[Path]:
         handle = shutil.which("handle.exe")
@@ -1141,6 +1166,8 @@ trouble cleaning up leftovers. You will need to manually remove {path}.
         write_file_atomically(
             self.user_config_path, toml.dumps(config.to_raw_dict()).encode()
         )
+        # Make sure subsequent lookups see the updated config.
+        self._config_parser = None
 
 
 class EdenCheckout:
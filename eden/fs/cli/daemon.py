@@ -7,6 +7,7 @@
 # pyre-strict
 
 import os
+import select
 import stat
 import subprocess
 import sys
@@ -30,21 +31,76 @@ from .util import is_apple_silicon, poll_until, print_stderr, ShutdownError
 DEFAULT_SIGKILL_TIMEOUT = 30.0
 
 
+def _wait_for_process_exit_using_pidfd(pid: int, timeout: float) -> Optional[bool]:
+    """Wait for the specified process ID to exit by polling a pidfd for it.
+
+    This lets the kernel wake us up as soon as the process exits rather than
+    repeatedly checking whether it is still alive.  Returns None if pidfds are not
+    supported on this system, in which case the caller should fall back to polling.
+    """
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+
+    try:
+        pidfd = pidfd_open(pid)
+    except ProcessLookupError:
+        # The process has already exited
+        return True
+    except OSError:
+        # ENOSYS on kernels older than 5.3, or EPERM in some sandboxes.
+        return None
+
+    try:
+        readable, _, _ = select.select([pidfd], [], [], timeout)
+        return bool(readable)
+    finally:
+        os.close(pidfd)
+
+
+def _has_child_process_exited(pid: int) -> Optional[bool]:
+    """Check whether the specified child process has exited, without reaping it.
+
+    Returns None if the process is not a child of this process (or waitid() is not
+    available), in which case the caller needs to fall back to a liveness probe.
+    This matters because a child that has exited but not yet been reaped still
+    accepts signals, so `kill(pid, 0)` alone would report it as alive.
+    """
+    waitid = getattr(os, "waitid", None)
+    if waitid is None:
+        return None
+
+    try:
+        result = waitid(os.P_PID, pid, os.WEXITED | os.WNOHANG | os.WNOWAIT)
+    except ChildProcessError:
+        return None
+    return result is not None
+
+
 def wait_for_process_exit(pid: int, timeout: float) -> bool:
     """Wait for the specified process ID to exit.
 
     Returns True if the process exits within the specified timeout, and False if the
     timeout expires while the process is still alive.
     """
+    exited = _wait_for_process_exit_using_pidfd(pid, timeout)
+    if exited is not None:
+        return exited
+
     proc_utils: proc_utils_mod.ProcUtils = proc_utils_mod.new()
 
     def process_exited() -> Optional[bool]:
+        child_exited = _has_child_process_exited(pid)
+        if child_exited is not None:
+            return True if child_exited else None
         if not proc_utils.is_process_alive(pid):
             return True
         return None
 
     try:
-        poll_until(process_exited, timeout=timeout)
+        # Most processes exit within a few milliseconds of being asked to, so
+        # start polling quickly and back off for the ones that take longer.
+        poll_until(process_exited, timeout=timeout, interval=0.001, max_interval=0.1)
         return True
     except TimeoutError:
         return False
@@ -71,8 +127,7 @@ def wait_for_shutdown(
     # timeout.  Take a more aggressive approach by sending SIGKILL.
     print_stderr(
         "error: sent shutdown request, but edenfs did not exit "
-        "within {} seconds. Attempting SIGKILL.",
-        timeout,
+        f"within {timeout} seconds. Attempting SIGKILL."
     )
     sigkill_process(pid, timeout=kill_timeout)
     return False
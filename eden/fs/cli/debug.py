@@ -80,7 +80,6 @@ except ModuleNotFoundError:
 from . import (
     cmd_util,
     hg_util,
-    rage as rage_mod,
     stats_print,
     subcmd as subcmd_mod,
     tabulate,
@@ -88,7 +87,13 @@ from . import (
 )
 from .config import EdenCheckout, EdenInstance
 from .subcmd import Subcmd
-from .util import format_cmd, format_mount, print_stderr, split_inodes_by_operation_type
+from .util import (
+    format_cmd,
+    format_mount,
+    grow_pipe_buffer,
+    print_stderr,
+    split_inodes_by_operation_type,
+)
 
 
 MB: int = 1024**2
@@ -730,8 +735,7 @@ def do_buildinfo(instance: EdenInstance, out: Optional[IO[bytes]] = None) -> Non
     if out is None:
         out = sys.stdout.buffer
     build_info = instance.get_server_build_info()
-    sorted_build_info = collections.OrderedDict(sorted(build_info.items()))
-    for key, value in sorted_build_info.items():
+    for key, value in sorted(build_info.items()):
         out.write(b"%s: %s\n" % (key.encode(), value.encode()))
 
 
@@ -1303,10 +1307,14 @@ class LogCmd(Subcmd):
         if rage_processor and not args.stdout:
             proc = subprocess.Popen(shlex.split(rage_processor), stdin=subprocess.PIPE)
             sink = proc.stdin
+            # pyre-fixme[6]: Expected `IO[bytes]` but got `Optional[IO[Any]]`.
+            grow_pipe_buffer(sink)
         else:
             proc = None
             sink = sys.stdout.buffer
 
+        from . import rage as rage_mod
+
         # pyre-fixme[6]: Expected `IO[bytes]` for 2nd param but got
         #  `Optional[typing.IO[typing.Any]]`.
         rage_mod.print_log_file(eden_log_path, sink, args.full, args.size)
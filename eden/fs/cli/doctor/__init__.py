@@ -11,7 +11,6 @@ import shlex
 import sys
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from textwrap import dedent
 from typing import Dict, List, Optional, Set
 
 from eden.fs.cli import (
@@ -925,7 +924,7 @@ but the version of EdenFS that is currently running is:
 Consider running `edenfsctl restart --graceful` to migrate to the newer version,
 which may have important bug fixes or performance improvements.
 """
-    tracker.add_problem(OutOfDateVersion(dedent(help_string)))
+    tracker.add_problem(OutOfDateVersion(help_string))
 
 
 class SlowHgImportProblem(Problem):
@@ -54,6 +54,16 @@ from fb303_core.ttypes import fb303_status
 # eden/fs/cli/doctor/test/doctor_test.py:770:5 Invalid decoration [56]: Pyre was not able to infer the type of argument `b"�eC!".__mul__(5)` to decorator factory `unittest.mock.patch`.
 
 
+# Commit hashes shared by the hg hash check tests.
+_SNAPSHOT_HEX = "12345678" * 5
+_DIRSTATE_HEX = "12000000" * 5
+_DIRSTATE_BIN = b"\x12\x00\x00\x00" * 5
+_DIRSTATE_PARENT2_HEX = "12340000" * 5
+_VALID_COMMIT_HEX = "87654321" * 5
+_VALID_COMMIT_BIN = b"\x87\x65\x43\x21" * 5
+_NULL_COMMIT_HEX = "00000000" * 5
+
+
 class SnapshotFormatTest(DoctorTestBase):
     """
     EdenFS doctor can parse the SNAPSHOT file directly. Validate its parse
@@ -93,15 +103,18 @@ class DoctorTest(DoctorTestBase):
     # The diffs for what is written to stdout can be large.
     maxDiff = None
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_end_to_end_test_with_various_scenarios(self, mock_watchman) -> None:
-        side_effects: List[Dict[str, Any]] = []
-        calls = []
+    def setUp(self) -> None:
+        super().setUp()
+        watchman_patcher = patch("eden.fs.cli.doctor.check_watchman._call_watchman")
+        self.mock_watchman = watchman_patcher.start()
+        self.addCleanup(watchman_patcher.stop)
+
+    def test_end_to_end_test_with_various_scenarios(self) -> None:
         instance = FakeEdenInstance(self.make_temporary_directory())
 
         # In edenfs_path1, we will break the snapshot check.
         edenfs_path1_snapshot = "abcd" * 10
-        edenfs_path1_dirstate_parent = "12345678" * 5
+        edenfs_path1_dirstate_parent = _SNAPSHOT_HEX
         checkout = instance.create_test_mount(
             "path1",
             snapshot=edenfs_path1_snapshot,
@@ -122,23 +135,16 @@ class DoctorTest(DoctorTestBase):
         edenfs_path3 = str(edenfs_path3)
         os.makedirs(edenfs_path3)
 
-        calls.append(call(["watch-list"]))
-        side_effects.append({"roots": [edenfs_path1, edenfs_path2, edenfs_path3]})
-
-        calls.append(call(["watch-project", edenfs_path1]))
-        side_effects.append({"watcher": "eden"})
-
-        calls.append(call(["watch-project", edenfs_path2]))
-        side_effects.append({"watcher": "inotify"})
-        calls.append(call(["watch-del", edenfs_path2]))
-        side_effects.append({"watch-del": True, "root": edenfs_path2})
-        calls.append(call(["watch-project", edenfs_path2]))
-        side_effects.append({"watcher": "eden"})
-
-        calls.append(call(["watch-project", edenfs_path3]))
-        side_effects.append({"watcher": "eden"})
-
-        mock_watchman.side_effect = side_effects
+        # (watchman command, response) in the order doctor should issue them.
+        watchman_steps: List[Tuple[List[str], Dict[str, Any]]] = [
+            (["watch-list"], {"roots": [edenfs_path1, edenfs_path2, edenfs_path3]}),
+            (["watch-project", edenfs_path1], {"watcher": "eden"}),
+            (["watch-project", edenfs_path2], {"watcher": "inotify"}),
+            (["watch-del", edenfs_path2], {"watch-del": True, "root": edenfs_path2}),
+            (["watch-project", edenfs_path2], {"watcher": "eden"}),
+            (["watch-project", edenfs_path3], {"watcher": "eden"}),
+        ]
+        self.mock_watchman.side_effect = [response for _, response in watchman_steps]
 
         out = TestOutput()
         dry_run = False
@@ -156,7 +162,7 @@ class DoctorTest(DoctorTestBase):
             out=out,
         )
 
-        self.assertEqual(
+        self.assertMultiLineEqual(
             f"""\
 Checking {edenfs_path1}
 <yellow>- Found problem:<reset>
@@ -180,24 +186,20 @@ Repairing hg directory contents for {edenfs_path3}...<green>fixed<reset>
 """,
             out.getvalue(),
         )
-        mock_watchman.assert_has_calls(calls)
+        self.mock_watchman.assert_has_calls([call(cmd) for cmd, _ in watchman_steps])
         self.assertEqual(0, exit_code)
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_not_all_mounts_have_watchman_watcher(self, mock_watchman) -> None:
+    def test_not_all_mounts_have_watchman_watcher(self) -> None:
         instance = FakeEdenInstance(self.make_temporary_directory())
         edenfs_path = str(instance.create_test_mount("eden-mount", scm_type="git").path)
         edenfs_path_not_watched = str(
             instance.create_test_mount("eden-mount-not-watched", scm_type="git").path
         )
-        side_effects: List[Dict[str, Any]] = []
-        calls = []
-
-        calls.append(call(["watch-list"]))
-        side_effects.append({"roots": [edenfs_path]})
-        calls.append(call(["watch-project", edenfs_path]))
-        side_effects.append({"watcher": "eden"})
-        mock_watchman.side_effect = side_effects
+        watchman_steps: List[Tuple[List[str], Dict[str, Any]]] = [
+            (["watch-list"], {"roots": [edenfs_path]}),
+            (["watch-project", edenfs_path], {"watcher": "eden"}),
+        ]
+        self.mock_watchman.side_effect = [response for _, response in watchman_steps]
 
         out = TestOutput()
         dry_run = False
@@ -220,54 +222,17 @@ Repairing hg directory contents for {edenfs_path3}...<green>fixed<reset>
             "<green>No issues detected.<reset>\n",
             out.getvalue(),
         )
-        mock_watchman.assert_has_calls(calls)
+        self.mock_watchman.assert_has_calls([call(cmd) for cmd, _ in watchman_steps])
         self.assertEqual(0, exit_code)
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_eden_not_in_use(self, mock_watchman) -> None:
-        instance = FakeEdenInstance(
-            self.make_temporary_directory(), status=fb303_status.DEAD
-        )
-
-        out = TestOutput()
-        dry_run = False
-        exit_code = doctor.cure_what_ails_you(
-            # pyre-fixme[6]: For 1st param expected `EdenInstance` but got
-            #  `FakeEdenInstance`.
-            instance,
-            dry_run,
-            mount_table=FakeMountTable(),
-            fs_util=FakeFsUtil(),
-            proc_utils=self.make_proc_utils(),
-            kerberos_checker=FakeKerberosChecker(),
-            vscode_extensions_checker=getFakeVSCodeExtensionsChecker(),
-            out=out,
-        )
+    def test_eden_not_in_use(self) -> None:
+        out, exit_code = self._cure_with_status(fb303_status.DEAD, create_mount=False)
 
         self.assertEqual("EdenFS is not in use.\n", out.getvalue())
         self.assertEqual(0, exit_code)
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_edenfs_not_running(self, mock_watchman) -> None:
-        instance = FakeEdenInstance(
-            self.make_temporary_directory(), status=fb303_status.DEAD
-        )
-        instance.create_test_mount("eden-mount")
-
-        out = TestOutput()
-        dry_run = False
-        exit_code = doctor.cure_what_ails_you(
-            # pyre-fixme[6]: For 1st param expected `EdenInstance` but got
-            #  `FakeEdenInstance`.
-            instance,
-            dry_run,
-            mount_table=FakeMountTable(),
-            fs_util=FakeFsUtil(),
-            proc_utils=self.make_proc_utils(),
-            kerberos_checker=FakeKerberosChecker(),
-            vscode_extensions_checker=getFakeVSCodeExtensionsChecker(),
-            out=out,
-        )
+    def test_edenfs_not_running(self) -> None:
+        out, exit_code = self._cure_with_status(fb303_status.DEAD)
 
         self.assertRegex(
             out.getvalue(),
@@ -284,27 +249,8 @@ Collect an 'eden rage' and ask in the EdenFS (Windows |macOS )?Users group if yo
         )
         self.assertEqual(1, exit_code)
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_edenfs_starting(self, mock_watchman) -> None:
-        instance = FakeEdenInstance(
-            self.make_temporary_directory(), status=fb303_status.STARTING
-        )
-        instance.create_test_mount("eden-mount")
-
-        out = TestOutput()
-        dry_run = False
-        exit_code = doctor.cure_what_ails_you(
-            # pyre-fixme[6]: For 1st param expected `EdenInstance` but got
-            #  `FakeEdenInstance`.
-            instance,
-            dry_run,
-            mount_table=FakeMountTable(),
-            fs_util=FakeFsUtil(),
-            proc_utils=self.make_proc_utils(),
-            kerberos_checker=FakeKerberosChecker(),
-            vscode_extensions_checker=getFakeVSCodeExtensionsChecker(),
-            out=out,
-        )
+    def test_edenfs_starting(self) -> None:
+        out, exit_code = self._cure_with_status(fb303_status.STARTING)
 
         self.assertRegex(
             out.getvalue(),
@@ -323,27 +269,8 @@ Collect an 'eden rage' and ask in the EdenFS (Windows |macOS )?Users group if yo
         )
         self.assertEqual(1, exit_code)
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_edenfs_stopping(self, mock_watchman) -> None:
-        instance = FakeEdenInstance(
-            self.make_temporary_directory(), status=fb303_status.STOPPING
-        )
-        instance.create_test_mount("eden-mount")
-
-        out = TestOutput()
-        dry_run = False
-        exit_code = doctor.cure_what_ails_you(
-            # pyre-fixme[6]: For 1st param expected `EdenInstance` but got
-            #  `FakeEdenInstance`.
-            instance,
-            dry_run,
-            mount_table=FakeMountTable(),
-            fs_util=FakeFsUtil(),
-            proc_utils=self.make_proc_utils(),
-            kerberos_checker=FakeKerberosChecker(),
-            vscode_extensions_checker=getFakeVSCodeExtensionsChecker(),
-            out=out,
-        )
+    def test_edenfs_stopping(self) -> None:
+        out, exit_code = self._cure_with_status(fb303_status.STOPPING)
 
         self.assertRegex(
             out.getvalue(),
@@ -360,96 +287,121 @@ Collect an 'eden rage' and ask in the EdenFS (Windows |macOS )?Users group if yo
         )
         self.assertEqual(1, exit_code)
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_no_issue_when_watchman_using_eden_watcher(self, mock_watchman) -> None:
-        fixer, out = self._test_watchman_watcher_check(
-            mock_watchman, initial_watcher="eden"
-        )
-        self.assertEqual("", out)
-        self.assert_results(fixer, num_problems=0)
+    def _cure_with_status(
+        self, status: fb303_status, create_mount: bool = True
+    ) -> Tuple[TestOutput, int]:
+        """Run doctor against an instance reporting the given daemon status, with
+        an empty mount table and the default fake checkers."""
+        instance = FakeEdenInstance(self.make_temporary_directory(), status=status)
+        if create_mount:
+            instance.create_test_mount("eden-mount")
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_fix_when_watchman_using_inotify_watcher(self, mock_watchman) -> None:
-        fixer, out = self._test_watchman_watcher_check(
-            mock_watchman, initial_watcher="inotify", new_watcher="eden", dry_run=False
+        out = TestOutput()
+        exit_code = doctor.cure_what_ails_you(
+            # pyre-fixme[6]: For 1st param expected `EdenInstance` but got
+            #  `FakeEdenInstance`.
+            instance,
+            dry_run=False,
+            mount_table=FakeMountTable(),
+            fs_util=FakeFsUtil(),
+            proc_utils=self.make_proc_utils(),
+            kerberos_checker=FakeKerberosChecker(),
+            vscode_extensions_checker=getFakeVSCodeExtensionsChecker(),
+            out=out,
         )
-        self.assertEqual(
+        return out, exit_code
+
+    def test_watchman_watcher_check(self) -> None:
+        wrong_watcher = (
+            "<yellow>- Found problem:<reset>\n"
+            "Watchman is watching /path/to/eden-mount with the wrong watcher type: "
+            '"inotify" instead of "eden"\n'
+        )
+        # Each case is (initial_watcher, new_watcher, dry_run, expected output,
+        # whether the output must match exactly or only contain the expected
+        # text, expected assert_results() counts).
+        cases: List[Tuple[str, Optional[str], bool, str, bool, Dict[str, int]]] = [
+            # No issue when watchman is using the eden watcher
+            ("eden", None, True, "", True, {"num_problems": 0}),
+            # Fix when watchman is using the inotify watcher
             (
-                "<yellow>- Found problem:<reset>\n"
-                "Watchman is watching /path/to/eden-mount with the wrong watcher type: "
-                '"inotify" instead of "eden"\n'
-                "Fixing watchman watch for /path/to/eden-mount...<green>fixed<reset>\n"
-                "\n"
+                "inotify",
+                "eden",
+                False,
+                wrong_watcher
+                + "Fixing watchman watch for /path/to/eden-mount...<green>fixed<reset>\n"
+                "\n",
+                True,
+                {"num_problems": 1, "num_fixed_problems": 1},
             ),
-            out,
-        )
-        self.assert_results(fixer, num_problems=1, num_fixed_problems=1)
-
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_dry_run_identifies_inotify_watcher_issue(self, mock_watchman) -> None:
-        fixer, out = self._test_watchman_watcher_check(
-            mock_watchman, initial_watcher="inotify", dry_run=True
-        )
-        self.assertEqual(
+            # A dry run identifies the inotify watcher issue
             (
-                "<yellow>- Found problem:<reset>\n"
-                "Watchman is watching /path/to/eden-mount with the wrong watcher type: "
-                '"inotify" instead of "eden"\n'
-                "Would fix watchman watch for /path/to/eden-mount\n"
-                "\n"
+                "inotify",
+                None,
+                True,
+                wrong_watcher + "Would fix watchman watch for /path/to/eden-mount\n"
+                "\n",
+                True,
+                {"num_problems": 1},
             ),
-            out,
-        )
-        self.assert_results(fixer, num_problems=1)
-
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_doctor_reports_failure_if_cannot_replace_inotify_watcher(
-        self, mock_watchman
-    ) -> None:
-        fixer, out = self._test_watchman_watcher_check(
-            mock_watchman,
-            initial_watcher="inotify",
-            new_watcher="inotify",
-            dry_run=False,
-        )
-        self.assertIn(
+            # Doctor reports a failure if it cannot replace the inotify watcher
             (
-                "<yellow>- Found problem:<reset>\n"
-                "Watchman is watching /path/to/eden-mount with the wrong watcher type: "
-                '"inotify" instead of "eden"\n'
-                "Fixing watchman watch for /path/to/eden-mount...<red>error<reset>\n"
+                "inotify",
+                "inotify",
+                False,
+                wrong_watcher
+                + "Fixing watchman watch for /path/to/eden-mount...<red>error<reset>\n"
                 "Failed to fix problem: RemediationError: Failed to replace "
-                'watchman watch for /path/to/eden-mount with an "eden" watcher'
+                'watchman watch for /path/to/eden-mount with an "eden" watcher',
+                False,
+                {"num_problems": 1, "num_failed_fixes": 1},
             ),
-            out,
-        )
-        self.assert_results(fixer, num_problems=1, num_failed_fixes=1)
+        ]
+        for initial_watcher, new_watcher, dry_run, expected, exact, results in cases:
+            with self.subTest(
+                initial_watcher=initial_watcher,
+                new_watcher=new_watcher,
+                dry_run=dry_run,
+            ):
+                self.mock_watchman.reset_mock()
+                fixer, out = self._test_watchman_watcher_check(
+                    initial_watcher=initial_watcher,
+                    new_watcher=new_watcher,
+                    dry_run=dry_run,
+                )
+                if exact:
+                    self.assertEqual(expected, out)
+                else:
+                    self.assertIn(expected, out)
+                self.assert_results(fixer, **results)
 
     def _test_watchman_watcher_check(
         self,
-        mock_watchman,
         initial_watcher: str,
         new_watcher: Optional[str] = None,
         dry_run: bool = True,
     ) -> Tuple[doctor.ProblemFixer, str]:
         edenfs_path = "/path/to/eden-mount"
-        side_effects: List[Dict[str, Any]] = []
-        calls = []
-
-        calls.append(call(["watch-project", edenfs_path]))
-        side_effects.append({"watch": edenfs_path, "watcher": initial_watcher})
+        watchman_steps: List[Tuple[List[str], Dict[str, Any]]] = [
+            (
+                ["watch-project", edenfs_path],
+                {"watch": edenfs_path, "watcher": initial_watcher},
+            ),
+        ]
 
         if initial_watcher != "eden" and not dry_run:
-            calls.append(call(["watch-del", edenfs_path]))
-            side_effects.append({"watch-del": True, "root": edenfs_path})
-
             self.assertIsNotNone(
                 new_watcher,
                 msg='Must specify new_watcher when initial_watcher is "eden".',
             )
-            calls.append(call(["watch-project", edenfs_path]))
-            side_effects.append({"watch": edenfs_path, "watcher": new_watcher})
-        mock_watchman.side_effect = side_effects
+            watchman_steps += [
+                (["watch-del", edenfs_path], {"watch-del": True, "root": edenfs_path}),
+                (
+                    ["watch-project", edenfs_path],
+                    {"watch": edenfs_path, "watcher": new_watcher},
+                ),
+            ]
+        self.mock_watchman.side_effect = [response for _, response in watchman_steps]
 
         fixer, out = self.create_fixer(dry_run)
 
@@ -457,19 +409,19 @@ Collect an 'eden rage' and ask in the EdenFS (Windows |macOS )?Users group if yo
         watchman_info = check_watchman.WatchmanCheckInfo(watchman_roots)
         check_watchman.check_active_mount(fixer, edenfs_path, watchman_info)
 
-        mock_watchman.assert_has_calls(calls)
+        self.mock_watchman.assert_has_calls([call(cmd) for cmd, _ in watchman_steps])
         return fixer, out.getvalue()
 
     def test_snapshot_and_dirstate_file_match(self) -> None:
-        dirstate_hash_hex = "12345678" * 5
-        snapshot_hex = "12345678" * 5
+        dirstate_hash_hex = _SNAPSHOT_HEX
+        snapshot_hex = _SNAPSHOT_HEX
         _checkout, fixer, out = self._test_hash_check(dirstate_hash_hex, snapshot_hex)
         self.assertEqual("", out)
         self.assert_results(fixer, num_problems=0)
 
     def test_snapshot_and_dirstate_file_differ(self) -> None:
-        dirstate_hash_hex = "12000000" * 5
-        snapshot_hex = "12345678" * 5
+        dirstate_hash_hex = _DIRSTATE_HEX
+        snapshot_hex = _SNAPSHOT_HEX
         checkout, fixer, out = self._test_hash_check(dirstate_hash_hex, snapshot_hex)
         self.assertEqual(
             f"""\
@@ -494,12 +446,12 @@ Repairing hg directory contents for {checkout.path}...<green>fixed<reset>
 
     def test_snapshot_and_dirstate_file_differ_and_snapshot_invalid(self) -> None:
         def check_commit_validity(commit: str) -> bool:
-            if commit == "12345678" * 5:
+            if commit == _SNAPSHOT_HEX:
                 return False
             return True
 
-        dirstate_hash_hex = "12000000" * 5
-        snapshot_hex = "12345678" * 5
+        dirstate_hash_hex = _DIRSTATE_HEX
+        snapshot_hex = _SNAPSHOT_HEX
         checkout, fixer, out = self._test_hash_check(
             dirstate_hash_hex, snapshot_hex, commit_checker=check_commit_validity
         )
@@ -521,7 +473,7 @@ Repairing hg directory contents for {checkout.path}...<green>fixed<reset>
             [
                 ResetParentsCommitsArgs(
                     mount=bytes(checkout.path),
-                    parent1=b"\x12\x00\x00\x00" * 5,
+                    parent1=_DIRSTATE_BIN,
                     parent2=None,
                     hg_root_manifest=None,
                 )
@@ -530,20 +482,20 @@ Repairing hg directory contents for {checkout.path}...<green>fixed<reset>
 
     @patch(
         "eden.fs.cli.doctor.check_hg.get_tip_commit_hash",
-        return_value=b"\x87\x65\x43\x21" * 5,
+        return_value=_VALID_COMMIT_BIN,
     )
     def test_snapshot_and_dirstate_file_differ_and_all_commit_hash_invalid(
         self, mock_get_tip_commit_hash
     ) -> None:
         def check_commit_validity(commit: str) -> bool:
-            null_commit = "00000000" * 5
+            null_commit = _NULL_COMMIT_HEX
             if commit == null_commit:
                 return True
             return False
 
-        dirstate_hash_hex = "12000000" * 5
-        snapshot_hex = "12345678" * 5
-        valid_commit_hash = "87654321" * 5
+        dirstate_hash_hex = _DIRSTATE_HEX
+        snapshot_hex = _SNAPSHOT_HEX
+        valid_commit_hash = _VALID_COMMIT_HEX
         checkout, fixer, out = self._test_hash_check(
             dirstate_hash_hex, snapshot_hex, commit_checker=check_commit_validity
         )
@@ -567,7 +519,7 @@ Repairing hg directory contents for {checkout.path}...<green>fixed<reset>
             [
                 ResetParentsCommitsArgs(
                     mount=bytes(checkout.path),
-                    parent1=b"\x87\x65\x43\x21" * 5,
+                    parent1=_VALID_COMMIT_BIN,
                     parent2=None,
                     hg_root_manifest=None,
                 )
@@ -577,7 +529,7 @@ Repairing hg directory contents for {checkout.path}...<green>fixed<reset>
 
     @patch(
         "eden.fs.cli.doctor.check_hg.get_tip_commit_hash",
-        return_value=b"\x87\x65\x43\x21" * 5,
+        return_value=_VALID_COMMIT_BIN,
     )
     def test_snapshot_and_dirstate_file_differ_and_all_parents_invalid(
         self, mock_get_tip_commit_hash
@@ -585,10 +537,10 @@ Repairing hg directory contents for {checkout.path}...<green>fixed<reset>
         def check_commit_validity(commit: str) -> bool:
             return False
 
-        dirstate_hash_hex = "12000000" * 5
-        dirstate_parent2_hash_hex = "12340000" * 5
-        snapshot_hex = "12345678" * 5
-        valid_commit_hash = "87654321" * 5
+        dirstate_hash_hex = _DIRSTATE_HEX
+        dirstate_parent2_hash_hex = _DIRSTATE_PARENT2_HEX
+        snapshot_hex = _SNAPSHOT_HEX
+        valid_commit_hash = _VALID_COMMIT_HEX
         checkout, fixer, out = self._test_hash_check(
             dirstate_hash_hex,
             snapshot_hex,
@@ -616,7 +568,7 @@ Repairing hg directory contents for {checkout.path}...<green>fixed<reset>
             [
                 ResetParentsCommitsArgs(
                     mount=bytes(checkout.path),
-                    parent1=b"\x87\x65\x43\x21" * 5,
+                    parent1=_VALID_COMMIT_BIN,
                     parent2=None,
                     hg_root_manifest=None,
                 )
@@ -628,12 +580,12 @@ Repairing hg directory contents for {checkout.path}...<green>fixed<reset>
         self,
     ) -> None:
         def check_commit_validity(commit: str) -> bool:
-            if commit == "12000000" * 5:
+            if commit == _DIRSTATE_HEX:
                 return False
             return True
 
-        dirstate_hash_hex = "12000000" * 5
-        snapshot_hex = "12345678" * 5
+        dirstate_hash_hex = _DIRSTATE_HEX
+        snapshot_hex = _SNAPSHOT_HEX
         checkout, fixer, out = self._test_hash_check(
             dirstate_hash_hex, snapshot_hex, commit_checker=check_commit_validity
         )
@@ -791,10 +743,8 @@ Would remount {mounts[1]}
         )
         self.assertEqual(exit_code, 1)
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
     def _test_remount_checkouts(
         self,
-        mock_watchman,
         dry_run: bool,
         old_edenfs: bool = False,
     ) -> Tuple[int, str, List[Path]]:
@@ -825,8 +775,7 @@ Would remount {mounts[1]}
         )
         return exit_code, out.getvalue(), mounts
 
-    @patch("eden.fs.cli.doctor.check_watchman._call_watchman")
-    def test_watchman_fails(self, mock_watchman) -> None:
+    def test_watchman_fails(self) -> None:
         tmp_dir = self.make_temporary_directory()
         instance = FakeEdenInstance(tmp_dir)
 
@@ -834,7 +783,7 @@ Would remount {mounts[1]}
 
         # Make calls to watchman fail rather than returning expected output
         side_effects = [{"error": "watchman failed"}]
-        mock_watchman.side_effect = side_effects
+        self.mock_watchman.side_effect = side_effects
 
         out = TestOutput()
         exit_code = doctor.cure_what_ails_you(
@@ -850,7 +799,7 @@ Would remount {mounts[1]}
 
         # "watchman watch-list" should have been called by the doctor code
         calls = [call(["watch-list"])]
-        mock_watchman.assert_has_calls(calls)
+        self.mock_watchman.assert_has_calls(calls)
 
         self.assertEqual(
             out.getvalue(),
@@ -1595,27 +1544,3 @@ Collect an 'eden rage' and ask in the EdenFS (Windows |macOS )?Users group if yo
         # SlowHgImportProblem should not be reported because we've ignored it in
         # the config.
         self.assertEqual(exit_code, 0)
-
-
-def _create_watchman_subscription(
-    filewatcher_subscriptions: Optional[List[str]] = None,
-) -> Dict:
-    if filewatcher_subscriptions is None:
-        filewatcher_subscriptions = []
-    subscribers = []
-    for filewatcher_subscription in filewatcher_subscriptions:
-        subscribers.append(
-            {
-                "info": {
-                    "name": filewatcher_subscription,
-                    "query": {
-                        "empty_on_fresh_instance": True,
-                        "defer_vcs": False,
-                        "fields": ["name", "new", "exists", "mode"],
-                        "relative_root": "fbcode",
-                        "since": "c:1511985586:2749065:2774073346:354",
-                    },
-                }
-            }
-        )
-    return {"subscribers": subscribers}
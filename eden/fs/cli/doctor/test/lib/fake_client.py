@@ -69,7 +69,7 @@ class FakeClient:
 
     def listMounts(self) -> List[eden_ttypes.MountInfo]:
         result = []
-        for mount in self._mount_table.mounts:
+        for mount in self._mount_table.read():
             mount_path = Path(os.fsdecode(mount.mount_point))
             client_name = mount_path.parts[-1]
             client_path = self._eden_dir / "clients" / client_name
@@ -123,7 +123,7 @@ class FakeClient:
     def getStatInfo(
         self, params: eden_ttypes.GetStatInfoParams
     ) -> eden_ttypes.InternalStats:
-        mount_paths = [mount.mount_point for mount in self._mount_table.mounts]
+        mount_paths = [mount.mount_point for mount in self._mount_table.read()]
         mount_point_info = {
             path: self._path_mount_inode_info[path] for path in mount_paths
         }
@@ -7,6 +7,8 @@
 # pyre-unsafe
 
 import binascii
+import functools
+import io
 import os
 import shutil
 import stat
@@ -36,6 +38,26 @@ from .fake_hg_repo import FakeHgRepo
 from .fake_mount_table import FakeMountTable
 
 
+@functools.lru_cache(maxsize=None)
+def _serialize_dirstate(parents: Tuple[bytes, bytes]) -> bytes:
+    """Return the contents of a dirstate file with the given parents and no
+    tracked files.  Most tests use one of a handful of parent hashes, so the
+    encoded bytes are reused rather than re-serialized for every checkout."""
+    buf = io.BytesIO()
+    eden.dirstate.write(buf, parents, tuples_dict={}, copymap={})
+    return buf.getvalue()
+
+
+# Files under .hg/ whose contents are the same for every fake checkout.
+_STATIC_HG_FILES: Tuple[Tuple[str, bytes], ...] = (
+    ("hgrc", b"# This file simply needs to exist\n"),
+    ("requires", b"eden\nremotefilelog\nrevlogv1\nstore\n"),
+    ("shared", b"bookmarks\n"),
+    ("bookmarks", b""),
+    ("branch", b"default\n"),
+)
+
+
 class FakeCheckout(NamedTuple):
     state_dir: Path
     config: CheckoutConfig
@@ -206,17 +228,13 @@ class FakeEdenInstance(AbstractEdenInstance):
                 binascii.unhexlify(dirstate_parent[1]),
             )
 
-        with dirstate_path.open("wb") as f:
-            eden.dirstate.write(f, parents, tuples_dict={}, copymap={})
+        dirstate_path.write_bytes(_serialize_dirstate(parents))
 
-        (hg_dir / "hgrc").write_text("# This file simply needs to exist\n")
-        (hg_dir / "requires").write_text("eden\nremotefilelog\nrevlogv1\nstore\n")
+        for name, contents in _STATIC_HG_FILES:
+            (hg_dir / name).write_bytes(contents)
         (hg_dir / "sharedpath").write_bytes(
             bytes(fake_checkout.config.backing_repo / ".hg")
         )
-        (hg_dir / "shared").write_text("bookmarks\n")
-        (hg_dir / "bookmarks").touch()
-        (hg_dir / "branch").write_text("default\n")
 
         source = str(fake_checkout.config.backing_repo)
         fake_repo = FakeHgRepo(source)
@@ -9,7 +9,6 @@
 import errno
 import os
 import subprocess
-import typing
 from typing import Dict, List, Optional, Set, Union
 
 from eden.fs.cli import mtab
@@ -23,6 +22,9 @@ EDENFS_DEVTYPE = "edenfs:"
 class FakeMountTable(mtab.MountTable):
     def __init__(self) -> None:
         self.mounts: List[mtab.MountInfo] = []
+        # Mount points that have been unmounted.  These are filtered out in
+        # read() rather than rebuilding self.mounts on every unmount.
+        self._removed: Set[bytes] = set()
         self.unmount_lazy_calls: List[bytes] = []
         self.unmount_force_calls: List[bytes] = []
         self.unmount_lazy_fails: Set[bytes] = set()
@@ -69,10 +71,15 @@ class FakeMountTable(mtab.MountTable):
         self.stats[path] = OSError(errnum, os.strerror(errnum))
 
     def _add_mount_info(self, path: str, device: str, vfstype: str) -> None:
+        mount_point = os.fsencode(path)
+        if mount_point in self._removed:
+            # Drop the entries from the earlier, unmounted instance of this path.
+            self._removed.discard(mount_point)
+            self.mounts[:] = [m for m in self.mounts if m.mount_point != mount_point]
         self.mounts.append(
             mtab.MountInfo(
                 device=device.encode("utf-8"),
-                mount_point=os.fsencode(path),
+                mount_point=mount_point,
                 vfstype=vfstype.encode("utf-8"),
             )
         )
@@ -84,7 +91,9 @@ class FakeMountTable(mtab.MountTable):
         self.unmount_force_fails |= set(mounts)
 
     def read(self) -> List[mtab.MountInfo]:
-        return self.mounts
+        if not self._removed:
+            return self.mounts
+        return [m for m in self.mounts if m.mount_point not in self._removed]
 
     def unmount_lazy(self, mount_point: bytes) -> bool:
         self.unmount_lazy_calls.append(mount_point)
@@ -103,38 +112,24 @@ class FakeMountTable(mtab.MountTable):
         return True
 
     def lstat(self, path: Union[bytes, str]) -> mtab.MTStat:
-        # If the input is bytes decode it to a string
-        if isinstance(path, bytes):
-            path = os.fsdecode(path)
-
-        try:
-            result = self.stats[path]
-        except KeyError:
-            raise OSError(errno.ENOENT, f"no path {path}")
-
-        if isinstance(result, BaseException):
-            raise result
-        else:
-            # pyre-fixme[22]: The cast is redundant.
-            return typing.cast(mtab.MTStat, result)
+        return self._lookup_stat(path)
 
     def check_path_access(self, path: bytes, mount_type: bytes) -> None:
-        path_str = os.fsdecode(path)
+        self._lookup_stat(path)
 
-        try:
-            result = self.stats[path_str]
-        except KeyError:
-            raise OSError(errno.ENOENT, f"no path {path_str}")
+    def _lookup_stat(self, path: Union[bytes, str]) -> mtab.MTStat:
+        # Paths are stored as strings; callers from mtab pass bytes.
+        path_str = path if isinstance(path, str) else os.fsdecode(path)
 
+        result = self.stats.get(path_str)
+        if result is None:
+            raise OSError(errno.ENOENT, f"no path {path_str}")
         if isinstance(result, BaseException):
             raise result
+        return result
 
     def _remove_mount(self, mount_point: bytes) -> None:
-        self.mounts[:] = [
-            mount_info
-            for mount_info in self.mounts
-            if mount_info.mount_point != mount_point
-        ]
+        self._removed.add(mount_point)
 
     def create_bind_mount(self, source_path: str, dest_path) -> bool:
         if (
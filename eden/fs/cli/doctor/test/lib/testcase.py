@@ -5,8 +5,10 @@
 # GNU General Public License version 2.
 
 import binascii
+import os
+import sys
 import unittest
-from typing import Tuple
+from typing import Optional, Tuple
 
 import eden.dirstate
 import eden.fs.cli.doctor as doctor
@@ -14,10 +16,45 @@ from eden.fs.cli.config import EdenCheckout
 from eden.fs.cli.doctor.test.lib.fake_eden_instance import FakeEdenInstance
 from eden.fs.cli.test.lib.fake_proc_utils import FakeProcUtils
 from eden.fs.cli.test.lib.output import TestOutput
-from eden.test_support.temporary_directory import TemporaryDirectoryMixin
+from eden.test_support.temporary_directory import (
+    TempFileManager,
+    TemporaryDirectoryMixin,
+)
+
+
+def _get_ramdisk_dir() -> Optional[str]:
+    """Return a tmpfs directory to hold test files, if one is available.
+
+    The doctor tests only create small scratch files, so keeping them in memory
+    avoids disk I/O for every .hg and state directory they write.  An explicit
+    TMPDIR always takes precedence.
+    """
+    if sys.platform != "linux" or "TMPDIR" in os.environ:
+        return None
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK | os.X_OK):
+        return shm
+    return None
 
 
 class DoctorTestBase(unittest.TestCase, TemporaryDirectoryMixin):
+    # Every test gets its own directories from make_temporary_directory(), but
+    # they all live under one top-level directory per class that is removed
+    # once in tearDownClass() rather than after each test.
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.temp_file_manager = TempFileManager(parent_dir=_get_ramdisk_dir())
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.temp_file_manager.cleanup()
+        super().tearDownClass()
+
+    def _ensure_temp_cleanup(self) -> None:
+        # Cleanup happens in tearDownClass().
+        pass
+
     def create_fixer(self, dry_run: bool) -> Tuple[doctor.ProblemFixer, TestOutput]:
         out = TestOutput()
         instance = FakeEdenInstance(self.make_temporary_directory())
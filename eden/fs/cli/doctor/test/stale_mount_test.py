@@ -7,7 +7,8 @@
 # pyre-unsafe
 
 import errno
-from typing import List, Tuple
+import os
+from typing import Tuple
 
 import eden.fs.cli.doctor as doctor
 from eden.fs.cli.doctor import check_stale_mounts
@@ -20,10 +21,10 @@ class StaleMountsCheckTest(DoctorTestBase):
     maxDiff = None
 
     def setUp(self) -> None:
-        self.active_mounts: List[bytes] = [b"/mnt/active1", b"/mnt/active2"]
+        self.active_mounts: Tuple[bytes, ...] = (b"/mnt/active1", b"/mnt/active2")
         self.mount_table = FakeMountTable()
-        self.mount_table.add_mount("/mnt/active1")
-        self.mount_table.add_mount("/mnt/active2")
+        for mount in self.active_mounts:
+            self.mount_table.add_mount(os.fsdecode(mount))
 
     def run_check(self, dry_run: bool) -> Tuple[doctor.ProblemFixer, str]:
         fixer, out = self.create_fixer(dry_run)
@@ -65,7 +66,7 @@ Unmounting 2 stale edenfs mounts...<green>fixed<reset>
             out,
         )
         self.assert_results(fixer, num_problems=1, num_fixed_problems=1)
-        self.assertEqual(
+        self.assertCountEqual(
             [b"/mnt/stale1", b"/mnt/stale2"], self.mount_table.unmount_lazy_calls
         )
         self.assertEqual([b"/mnt/stale1"], self.mount_table.unmount_force_calls)
@@ -110,10 +111,10 @@ Failed to fix problem: RemediationError: Failed to unmount 1 mount point:
             out,
         )
         self.assert_results(fixer, num_problems=1, num_failed_fixes=1)
-        self.assertEqual(
+        self.assertCountEqual(
             [b"/mnt/stale1", b"/mnt/stale2"], self.mount_table.unmount_lazy_calls
         )
-        self.assertEqual(
+        self.assertCountEqual(
             [b"/mnt/stale1", b"/mnt/stale2"], self.mount_table.unmount_force_calls
         )
 
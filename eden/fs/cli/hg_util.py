@@ -10,7 +10,7 @@ import binascii
 import os
 import typing
 from pathlib import Path
-from typing import BinaryIO, Dict, Tuple
+from typing import BinaryIO, Dict, Optional, Tuple
 
 import eden.dirstate
 
@@ -125,10 +125,19 @@ def get_requires_data(checkout: EdenCheckout) -> str:
 _possible_dot_dirs = (".hg", ".sl")
 
 
-def sniff_dot_dir(repo_root: Path) -> str:
+def find_dot_dir(repo_root: Path) -> Optional[str]:
+    """Return the name of the .hg or .sl entry that exists in repo_root, or None
+    if there is neither."""
     for dot_dir in _possible_dot_dirs:
         if (repo_root / dot_dir).exists():
             return dot_dir
+    return None
+
+
+def sniff_dot_dir(repo_root: Path) -> str:
+    dot_dir = find_dot_dir(repo_root)
+    if dot_dir is not None:
+        return dot_dir
 
     env_ident = os.environ.get("HGIDENTITY", os.environ.get("SLIDENTITY", None))
     if env_ident in {"hg", "sl"}:
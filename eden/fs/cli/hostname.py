@@ -4,6 +4,7 @@
 # This software may be used and distributed according to the terms of the
 # GNU General Public License version 2.
 
+import functools
 import socket
 
 try:
@@ -14,6 +15,7 @@ except ImportError:
         return hostname
 
 
+@functools.lru_cache(maxsize=None)
 def get_normalized_hostname() -> str:
     """Get the system's normalized hostname for logging and telemetry purposes."""
 
@@ -10,6 +10,7 @@ import argparse
 import asyncio
 import enum
 import errno
+import functools
 import inspect
 import json
 import os
@@ -47,15 +48,12 @@ from . import (
     daemon,
     daemon_util,
     debug as debug_mod,
-    doctor as doctor_mod,
     hg_util,
     mtab,
     prefetch as prefetch_mod,
-    rage as rage_mod,
     redirect as redirect_mod,
     stats as stats_mod,
     subcmd as subcmd_mod,
-    top as top_mod,
     trace as trace_mod,
     ui,
     util,
@@ -159,6 +157,8 @@ def do_version(args: argparse.Namespace, format_json: bool = False) -> int:
 
 @subcmd("version", "Print EdenFS's version information.")
 class VersionCmd(Subcmd):
+    REQUIRES_LIVE_CWD = False
+
     def setup_parser(self, parser: argparse.ArgumentParser) -> None:
         parser.add_argument(
             "--json",
@@ -865,7 +865,7 @@ is case-sensitive. This is not recommended and is intended only for testing."""
                 args.enable_windows_symlinks,
             )
         except RepoError as ex:
-            print_stderr("error: {}", ex)
+            print_stderr(f"error: {ex}")
             return 1
 
         # If it's source control respository
@@ -963,7 +963,7 @@ is case-sensitive. This is not recommended and is intended only for testing."""
             # to want to access soon.
             return 0
         except Exception as ex:
-            print_stderr("error: {}", ex)
+            print_stderr(f"error: {ex}")
             return 1
 
     def _get_enable_sqlite_overlay(
@@ -1102,6 +1102,8 @@ class DoctorCmd(Subcmd):
         )
 
     def run(self, args: argparse.Namespace) -> int:
+        from . import doctor as doctor_mod
+
         instance = get_eden_instance(args)
         doctor = doctor_mod.EdenDoctor(instance, args.dry_run, args.debug, args.fast)
         if args.current_edenfs_only:
@@ -1154,6 +1156,9 @@ class TopCmd(Subcmd):
         if sys.platform == "win32":
             print_stderr("`edenfsctl top` isn't supported on Windows yet.")
             return 1
+
+        from . import top as top_mod
+
         top = top_mod.Top()
         return top.start(args)
 
@@ -1436,15 +1441,25 @@ class MountCmd(Subcmd):
 
     def run(self, args: argparse.Namespace) -> int:
         instance = get_eden_instance(args)
-        for path in args.paths:
-            try:
-                exitcode = instance.mount(path, args.read_only)
-                if exitcode:
-                    return exitcode
-            except (EdenService.EdenError, EdenNotRunningError) as ex:
-                print_stderr("error: {}", ex)
-                return 1
-        return 0
+        exit_code = 0
+        try:
+            # Share one thrift connection across all of the requested mounts
+            # rather than reconnecting for each path.
+            with instance.get_thrift_client_legacy() as client:
+                for path in args.paths:
+                    try:
+                        exit_code = max(
+                            exit_code,
+                            instance.mount_with_client(client, path, args.read_only),
+                        )
+                    except EdenService.EdenError as ex:
+                        print_stderr(f"error: {ex}")
+                        exit_code = max(exit_code, 1)
+                    # Continue around the loop mounting any other checkouts
+        except EdenNotRunningError as ex:
+            print_stderr(f"error: {ex}")
+            return 1
+        return exit_code
 
 
 # Types of removal
@@ -1517,10 +1532,19 @@ class RemoveCmd(Subcmd):
                     file=sys.stderr,
                 )
                 return 1
-            try:
-                mount_path = util.get_eden_mount_name(path)
+            mount_path = None
+            if util.is_eden_mount(path):
+                try:
+                    mount_path = util.get_eden_mount_name(path)
+                except util.NotAnEdenMountError:
+                    pass
+                except Exception as ex:
+                    print(f"error: cannot determine mount point for {path}: {ex}")
+                    return 1
+
+            if mount_path is not None:
                 remove_type = RemoveType.ACTIVE_MOUNT
-            except util.NotAnEdenMountError as ex:
+            else:
                 # This is not an active mount point.
                 # Check for it by name in the config file anyway, in case it is
                 # listed in the config file but not currently mounted.
@@ -1558,13 +1582,9 @@ Do you still want to delete {path}?"""
                     else:
                         # We can't ask the user what their true intentions are,
                         # so let's fail by default.
-                        print(f"error: {ex}")
+                        print(f"error: {util.NotAnEdenMountError(path)}")
                         return 1
 
-            except Exception as ex:
-                print(f"error: cannot determine mount point for {path}: {ex}")
-                return 1
-
             if os.path.realpath(mount_path) != os.path.realpath(path):
                 print(
                     f"error: {path} is not the root of checkout "
@@ -1690,15 +1710,18 @@ class UnmountCmd(Subcmd):
             )
 
         instance = get_eden_instance(args)
-        for path in args.paths:
-            path = normalize_path_arg(path)
-            try:
-                instance.unmount(path)
-                if args.destroy:
-                    instance.destroy_mount(path)
-            except (EdenService.EdenError, EdenNotRunningError) as ex:
-                print_stderr(f"error: {ex}")
-                return 1
+        try:
+            # Share one connection across all of the paths rather than
+            # reconnecting to edenfs for each unmount.
+            with instance.get_thrift_client_legacy(timeout=60) as client:
+                for path in args.paths:
+                    path = normalize_path_arg(path)
+                    instance.unmount_with_client(client, path)
+                    if args.destroy:
+                        instance.destroy_mount(path)
+        except (EdenService.EdenError, EdenNotRunningError) as ex:
+            print_stderr(f"error: {ex}")
+            return 1
         return 0
 
 
@@ -1849,7 +1872,7 @@ class StartCmd(Subcmd):
 def unmount_redirections_for_path(
     repo_path: str, complain_about_failing_to_unmount_redirs: bool
 ) -> None:
-    parser = create_parser()
+    parser = create_parser("redirect")
     args = parser.parse_args(["redirect", "unmount", "--mount", repo_path])
     try:
         args.func(args)
@@ -1866,6 +1889,13 @@ def stop_aux_processes_for_path(
     """Tear down processes that will hold onto file handles and prevent shutdown
     for a given mount point/repo"""
     buck.stop_buckd_for_repo(repo_path)
+    _stop_aux_processes_after_buck(repo_path, complain_about_failing_to_unmount_redirs)
+
+
+def _stop_aux_processes_after_buck(
+    repo_path: str, complain_about_failing_to_unmount_redirs: bool
+) -> None:
+    """The rest of stop_aux_processes_for_path() once buckd has been stopped"""
     unmount_redirections_for_path(repo_path, complain_about_failing_to_unmount_redirs)
     stop_internal_processes(repo_path)
 
@@ -1874,23 +1904,95 @@ def stop_aux_processes(client: EdenClient) -> None:
     """Tear down processes that will hold onto file handles and prevent shutdown
     for all mounts"""
 
-    active_mount_points: Set[Optional[str]] = {
-        os.fsdecode(mount.mountPoint) for mount in client.listMounts()
-    }
+    # listMounts() never reports the same mount point twice, so there is no need
+    # to de-duplicate the results before decoding them.
+    repo_paths = [
+        os.fsdecode(mount.mountPoint)
+        for mount in client.listMounts()
+        if mount.mountPoint
+    ]
+    if not repo_paths:
+        return
 
-    for repo in active_mount_points:
-        if repo is not None:
-            stop_aux_processes_for_path(repo)
+    errors: Dict[str, BaseException] = {}
+    projects_by_repo: Dict[str, List[str]] = {}
+    for repo in repo_paths:
+        try:
+            projects_by_repo[repo] = buck.find_running_buckd_projects(repo)
+        except Exception as ex:
+            errors[repo] = ex
+
+    # Each buck kill starts a JVM and can take several seconds, so stop buckd in
+    # every repository from a single bounded pool rather than one repository at
+    # a time.
+    buck_failures = dict(
+        buck.stop_buckd_for_projects(
+            [project for projects in projects_by_repo.values() for project in projects]
+        )
+    )
+
+    # The remaining steps are cheap, so run them one repository at a time to
+    # keep each repository's output together.
+    for repo in repo_paths:
+        error = errors.get(repo)
+        if error is None:
+            error = next(
+                (
+                    buck_failures[p]
+                    for p in projects_by_repo[repo]
+                    if p in buck_failures
+                ),
+                None,
+            )
+        if error is None:
+            try:
+                _stop_aux_processes_after_buck(
+                    repo, complain_about_failing_to_unmount_redirs=True
+                )
+            except Exception as ex:
+                error = ex
+
+        if error is not None:
+            print_stderr(f"error stopping auxiliary processes for {repo}: {error}")
 
     # TODO: intelligently stop nuclide-server associated with eden
     # print('Stopping nuclide-server...')
     # subprocess.run(['pkill', '-f', 'nuclide-main'])
 
 
+@functools.lru_cache(maxsize=None)
+def _get_requester_info() -> str:
+    """Describe this process in the shutdown reason we send to edenfs."""
+    request_info = f"pid={os.getpid()}"
+    if sys.platform != "win32":
+        # os.getuid() is not available on Windows
+        request_info += f" uid={os.getuid()}"
+    return request_info
+
+
+if sys.platform != "win32":
+    # Keep the cached pid correct should the CLI ever fork.
+    os.register_at_fork(after_in_child=_get_requester_info.cache_clear)
+
+
 RESTART_MODE_FULL = "full"
 RESTART_MODE_GRACEFUL = "graceful"
 RESTART_MODE_FORCE = "force"
 
+# How long `eden restart --force` waits for a daemon in the given state to stop
+# before killing it.  Any other state (generally STOPPED, meaning the process
+# exists but is not answering thrift calls) maps to 0: don't ask it to stop at
+# all, just kill it.
+_FORCE_RESTART_STOP_TIMEOUTS: Dict[int, int] = {
+    # Give the daemon a little extra time to hopefully finish starting before we
+    # time out and kill it.
+    fb303_status.STARTING: 30,
+    # Use a reduced stopping timeout.  If the user is using --force then the
+    # daemon is probably stuck or something, and we'll likely need to kill it
+    # anyway.
+    fb303_status.STOPPING: 5,
+}
+
 
 @subcmd("restart", "Restart the EdenFS service")
 # pyre-fixme[13]: Attribute `args` is never initialized.
@@ -1982,7 +2084,7 @@ class RestartCmd(Subcmd):
         edenfs_pid = health.pid
         if health.is_healthy():
             assert edenfs_pid is not None
-            if self.args.restart_type == RESTART_MODE_GRACEFUL:
+            if args.restart_type == RESTART_MODE_GRACEFUL:
                 return self._graceful_restart(instance)
             else:
                 status = self._full_restart(instance, edenfs_pid, args.migrate_to)
@@ -1997,35 +2099,27 @@ class RestartCmd(Subcmd):
             else:
                 return self._start(instance)
         else:
-            if health.status == fb303_status.STARTING:
+            status = health.status
+            if status == fb303_status.STARTING:
                 print(
-                    f"The current edenfs daemon (pid {health.pid}) is still starting."
+                    f"The current edenfs daemon (pid {edenfs_pid}) is still starting."
                 )
-                # Give the daemon a little extra time to hopefully finish starting
-                # before we time out and kill it.
-                stop_timeout = 30
-            elif health.status == fb303_status.STOPPING:
+            elif status == fb303_status.STOPPING:
                 print(
-                    f"The current edenfs daemon (pid {health.pid}) is in the middle "
+                    f"The current edenfs daemon (pid {edenfs_pid}) is in the middle "
                     "of stopping."
                 )
-                # Use a reduced stopping timeout.  If the user is using --force
-                # then the daemon is probably stuck or something, and we'll likely need
-                # to kill it anyway.
-                stop_timeout = 5
             else:
                 # The only other status value we generally expect to receive here is
                 # fb303_status.STOPPED.  This is returned if we found an existing edenfs
                 # process but it is not responding to thrift calls.
                 print(
-                    f"Found an existing edenfs daemon (pid {health.pid} that does not "
+                    f"Found an existing edenfs daemon (pid {edenfs_pid} that does not "
                     "seem to be responding to thrift calls."
                 )
-                # Don't attempt to ask the daemon to stop at all in this case;
-                # just kill it.
-                stop_timeout = 0
+            stop_timeout = _FORCE_RESTART_STOP_TIMEOUTS.get(status, 0)
 
-            if not self.args.force_restart:
+            if not args.force_restart:
                 print(
                     "Use `eden restart --force` if you want to forcibly restart the current daemon"
                 )
@@ -2177,10 +2271,9 @@ re-open these files after EdenFS is restarted.
             except Exception:
                 pass
             try:
-                message = f"`eden restart --force` requested by pid={os.getpid()}"
-                if sys.platform != "win32":
-                    message += f" uid={os.getuid()}"
-                client.initiateShutdown(message)
+                client.initiateShutdown(
+                    f"`eden restart --force` requested by {_get_requester_info()}"
+                )
             except Exception:
                 print("Sending SIGTERM...")
                 os.kill(pid, signal.SIGTERM)
@@ -2236,6 +2329,8 @@ class RageCmd(Subcmd):
         )
 
     def run(self, args: argparse.Namespace) -> int:
+        from . import rage as rage_mod
+
         instance = get_eden_instance(args)
         instance.log_sample("eden_rage")
         rage_processor = instance.get_config_value("rage.reporter", default="")
@@ -2257,11 +2352,21 @@ class RageCmd(Subcmd):
             # violate that, then the proc.wait() could fail if its stdout pipe was full,
             # since we don't consume it until afterwards.
             if rage_processor and not args.stdout and not args.stderr:
+                rage_cmd = shlex.split(rage_processor)
+                # Giving subprocess an absolute executable path and leaving
+                # close_fds off lets it launch the reporter with posix_spawn()
+                # instead of fork()+exec().  Our own descriptors are all
+                # close-on-exec already, so nothing extra leaks into the reporter.
+                rage_cmd[0] = shutil.which(rage_cmd[0]) or rage_cmd[0]
                 proc = subprocess.Popen(
-                    shlex.split(rage_processor),
+                    rage_cmd,
                     stdin=subprocess.PIPE,
+                    close_fds=False,
                 )
                 sink = typing.cast(typing.IO[bytes], proc.stdin)
+                # Let the report generation run ahead of the reporter instead of
+                # stalling each time the default pipe buffer fills up.
+                util.grow_pipe_buffer(sink)
             elif args.stderr:
                 proc = None
                 sink = sys.stderr.buffer
@@ -2322,15 +2427,18 @@ class StopCmd(Subcmd):
                 with instance.get_thrift_client_legacy(
                     timeout=self.__thrift_timeout(args)
                 ) as client:
-                    pid = client.getPid()
+                    try:
+                        # The lockfile holds the daemon's pid, and reading it is a
+                        # local file read rather than a round trip to edenfs.
+                        pid = util.get_pid_using_lockfile(instance.state_dir)
+                    except (OSError, ValueError):
+                        pid = client.getPid()
                     stop_aux_processes(client)
                     # Ask the client to shutdown
                     print(f"Stopping edenfs daemon (pid {pid})...")
-                    request_info = f"pid={os.getpid()}"
-                    if sys.platform != "win32":
-                        # os.getuid() is not available on Windows
-                        request_info += f" uid={os.getuid()}"
-                    client.initiateShutdown(f"`eden stop` requested by {request_info}")
+                    client.initiateShutdown(
+                        f"`eden stop` requested by {_get_requester_info()}"
+                    )
             except thrift.transport.TTransport.TTransportException as e:
                 print_stderr(f"warning: edenfs daemon is not responding: {e}")
                 if pid is None:
@@ -2383,8 +2491,14 @@ class StopCmd(Subcmd):
             return args.timeout
 
 
-def create_parser() -> argparse.ArgumentParser:
-    """Returns a parser"""
+def create_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """Returns a parser
+
+    If `command` names a subcommand (or one of its aliases), only that
+    subcommand's arguments are set up.  Building the arguments for every
+    subcommand is a significant part of the CLI's startup time, and is wasted
+    work when we already know which one will run.
+    """
     parser = argparse.ArgumentParser(
         prog="edenfsctl", description="Manage EdenFS checkouts."
     )
@@ -2428,7 +2542,16 @@ def create_parser() -> argparse.ArgumentParser:
 
     subcmd_add_list.append(debug_mod.DebugCmd)
 
-    subcmd_mod.add_subcommands(parser, subcmd.commands + subcmd_add_list)
+    cmds = subcmd.commands + subcmd_add_list
+    if command is not None:
+        selected = [
+            cmd for cmd in cmds if command == cmd.NAME or command in (cmd.ALIASES or [])
+        ]
+        # Fall back to the full parser for unknown names so that argparse can
+        # report them properly.
+        if selected:
+            cmds = selected
+    subcmd_mod.add_subcommands(parser, cmds)
 
     return parser
 
@@ -2445,10 +2568,42 @@ def normalize_path_arg(path_arg: str, may_need_tilde_expansion: bool = False) ->
             path_arg = os.path.expanduser(path_arg)
 
         # Use the canonical version of the path.
-        path_arg = os.path.realpath(path_arg)
+        path_arg = _realpath(path_arg)
     return path_arg
 
 
+def _realpath(path: str) -> str:
+    """Equivalent to os.path.realpath(), but cheaper for existing paths on Linux.
+
+    os.path.realpath() walks the path in Python and issues an lstat() for every
+    component.  On Linux we can instead have the kernel resolve the whole path in
+    a single open(O_PATH) call and read the result back from /proc.  Checking
+    only the final component with lstat() would not be enough, since any parent
+    directory may also be a symlink.
+    """
+    if sys.platform == "linux":
+        try:
+            fd = os.open(path, os.O_PATH | os.O_CLOEXEC)
+        except OSError:
+            # Most likely the path does not exist; realpath() handles that.
+            return os.path.realpath(path)
+        try:
+            resolved = os.readlink(f"/proc/self/fd/{fd}")
+        except OSError:
+            resolved = None
+        finally:
+            os.close(fd)
+        # The kernel decorates paths that are not reachable from our root or that
+        # have been deleted; let realpath() deal with those.
+        if (
+            resolved is not None
+            and resolved.startswith("/")
+            and not resolved.endswith(" (deleted)")
+        ):
+            return resolved
+    return os.path.realpath(path)
+
+
 def set_working_directory(args: argparse.Namespace) -> Optional[int]:
     if args.checkout_dir is None:
         return
@@ -2461,6 +2616,11 @@ def set_working_directory(args: argparse.Namespace) -> Optional[int]:
 
 
 def is_working_directory_stale() -> bool:
+    # getcwd() is answered from the kernel's dentry cache and never sends a request
+    # to the FUSE daemon, so it cannot hang on a dead or wedged edenfs.  Probes
+    # such as stat(".") or statx(AT_STATX_DONT_SYNC) are not suitable here: the
+    # former issues a FUSE GETATTR, and the latter returns cached attributes
+    # without noticing that the FUSE connection is gone.
     try:
         os.getcwd()
         return False
@@ -2505,6 +2665,8 @@ Please run "cd / && cd -" to update your shell's working directory."""
         return EX_OSFILE
 
     print(f"Warning: {msg}", file=sys.stderr)
+    from . import doctor as doctor_mod
+
     doctor_mod.working_directory_was_stale = True
     return None
 
@@ -2516,10 +2678,20 @@ async def async_main(parser: argparse.ArgumentParser, args: argparse.Namespace)
 
     # Before doing anything else check that the current working directory is valid.
     # This helps catch the case where a user is trying to run the EdenFS CLI inside
-    # a stale eden mount point.
-    stale_return_code = check_for_stale_working_directory()
-    if stale_return_code is not None:
-        return stale_return_code
+    # a stale eden mount point.  Skip this for --version, bare help output and
+    # commands that only print static information: they never use the working
+    # directory or start subprocesses in it, so there is nothing to warn about or
+    # recover.
+    func = getattr(args, "func", None)
+    cmd = getattr(func, "__self__", None)
+    if (
+        func is not None
+        and not args.version
+        and getattr(cmd, "REQUIRES_LIVE_CWD", True)
+    ):
+        stale_return_code = check_for_stale_working_directory()
+        if stale_return_code is not None:
+            return stale_return_code
 
     if args.config_dir == "":
         print_stderr("error: empty --config-dir path specified")
@@ -2555,7 +2727,13 @@ except AttributeError:
 
 
 def main() -> int:
-    parser = create_parser()
+    # When the subcommand is the first argument we only need to build its parser.
+    # Top-level options before the subcommand, and `help` (which describes the
+    # sibling commands), still require the full parser.
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "help":
+        command = None
+    parser = create_parser(command)
     args = parser.parse_args()
 
     # The default event loop on 3.8+ will cause an ugly backtrace when
@@ -15,7 +15,7 @@ import random
 import re
 import subprocess
 import sys
-from typing import List, NamedTuple, Union
+from typing import List, NamedTuple, Pattern, Union
 
 
 log: logging.Logger = logging.getLogger("eden.fs.cli.mtab")
@@ -174,15 +174,16 @@ class LinuxMountTable(MountTable):
         )
 
 
+_MACOS_MOUNT_LINE_RE: Pattern[bytes] = re.compile(
+    b"^(\\S+) on (.+) \\(([^,\\n]+),.*\\)$", re.MULTILINE
+)
+
+
 def parse_macos_mount_output(contents: bytes) -> List[MountInfo]:
-    mounts = []
-    for line in contents.splitlines():
-        m = re.match(b"^(\\S+) on (.+) \\(([^,]+),.*\\)$", line)
-        if m:
-            mounts.append(
-                MountInfo(device=m.group(1), mount_point=m.group(2), vfstype=m.group(3))
-            )
-    return mounts
+    return [
+        MountInfo(device=m.group(1), mount_point=m.group(2), vfstype=m.group(3))
+        for m in _MACOS_MOUNT_LINE_RE.finditer(contents)
+    ]
 
 
 class MacOSMountTable(MountTable):
@@ -459,6 +459,15 @@ class LinuxProcUtils(UnixProcUtils):
                 holding_lock=holding_lock,
             )
 
+    def _get_process_command(self, pid: int) -> Optional[str]:
+        # Read the command name straight from /proc rather than spawning ps.
+        # This is polled while waiting for edenfs to become healthy.
+        try:
+            comm = (self.proc_path / str(pid) / "comm").read_bytes()
+        except OSError:
+            return None
+        return comm.rstrip().decode("utf8")
+
     def stat_process_dir(self, path: Path) -> os.stat_result:
         """Call lstat() on a /proc/PID directory.
         This exists as a separate method solely to allow it to be overridden in unit
@@ -510,7 +519,9 @@ class LinuxProcUtils(UnixProcUtils):
         if not partition:
             raise ValueError("unexpected data in {stat_path}: {stat_data!r}")
         try:
-            fields = fields_str.split(b" ")
+            # starttime is the 20th field after the command name; leave the rest
+            # of the line unsplit.
+            fields = fields_str.split(b" ", 20)
             jiffies_after_boot = int(fields[19])
         except (ValueError, IndexError):
             raise ValueError("unexpected data in {stat_path}: {stat_data!r}")
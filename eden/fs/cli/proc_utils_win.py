@@ -6,6 +6,7 @@
 
 import ctypes
 import datetime
+import ntpath
 import sys
 import types
 from ctypes.wintypes import (
@@ -24,21 +25,32 @@ from . import proc_utils
 
 
 if sys.platform == "win32":
-    _win32 = ctypes.windll.kernel32
+    # use_last_error makes ctypes save each call's error code as soon as the
+    # call returns, so it can't be clobbered before we read it.
+    _win32 = ctypes.WinDLL("kernel32", use_last_error=True)
     _win32.OpenProcess.argtypes = [_DWORD, _BOOL, _DWORD]
     _win32.OpenProcess.restype = _HANDLE
 
+    _win32.CloseHandle.argtypes = [_HANDLE]
+    _win32.CloseHandle.restype = _BOOL
+
+    _win32.TerminateProcess.argtypes = [_HANDLE, ctypes.c_uint]
+    _win32.TerminateProcess.restype = _BOOL
+
     _win32.GetExitCodeProcess.argtypes = [_HANDLE, _LPDWORD]
     _win32.GetExitCodeProcess.restype = _BOOL
 
-    psapi = ctypes.windll.psapi
-    psapi.GetProcessImageFileNameW.argstypes = [_HANDLE, _LPWSTR, _DWORD]
+    psapi = ctypes.WinDLL("psapi", use_last_error=True)
+    psapi.GetProcessImageFileNameW.argtypes = [_HANDLE, _LPWSTR, _DWORD]
     psapi.GetProcessImageFileNameW.restype = _DWORD
 
-    advapi32 = ctypes.windll.advapi32
+    advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
 
     def raise_win_error() -> NoReturn:
-        raise ctypes.WinError()
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    def get_last_error() -> int:
+        return ctypes.get_last_error()
 
 else:
     # This entire file is only ever imported in Windows.  However on our continuous
@@ -89,6 +101,9 @@ else:
     def raise_win_error() -> NoReturn:
         ...
 
+    def get_last_error() -> int:
+        ...
+
 
 _PROCESS_TERMINATE = 0x0001
 _PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
@@ -220,8 +235,16 @@ class WinProcUtils(proc_utils.ProcUtils):
 
     def is_process_alive(self, pid: int) -> bool:
         """Returns if a process is currently running."""
+        # Call OpenProcess() directly rather than through open_process() so that
+        # the common failure cases don't have to build and unwind an OSError.
+        handle_value = _win32.OpenProcess(
+            _PROCESS_QUERY_LIMITED_INFORMATION, False, pid
+        )
+        if handle_value is None:
+            # The process exists if we were only denied permission to open it.
+            return get_last_error() == _ERROR_ACCESS_DENIED
         try:
-            with open_process(pid) as handle:
+            with Handle(handle_value) as handle:
                 return get_exit_code(handle) is None
         except PermissionError:
             # The process exists, but we don't have permission to query it.
@@ -243,6 +266,7 @@ class WinProcUtils(proc_utils.ProcUtils):
                 name = get_process_name(handle)
                 if name is None:
                     return False
-                return name.endswith("edenfs.exe")
+                # Windows file names are case-insensitive.
+                return ntpath.basename(name).lower() == "edenfs.exe"
         except Exception:
             return False
@@ -4,7 +4,10 @@
 # This software may be used and distributed according to the terms of the
 # GNU General Public License version 2.
 
+import concurrent.futures
 import csv
+import errno
+import functools
 import getpass
 import io
 import os
@@ -17,7 +20,16 @@ import sys
 import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Callable, cast, Dict, Generator, IO, List, Optional, Tuple
+from typing import (
+    Callable,
+    cast,
+    Dict,
+    IO,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+)
 
 from . import (
     debug as debug_mod,
@@ -74,6 +86,11 @@ except ImportError:
         return None
 
 
+# On Windows, run console programs with CREATE_NO_WINDOW so that each one
+# doesn't have to set up a console of its own.
+_CREATION_FLAGS: int = 0x08000000 if sys.platform == "win32" else 0
+
+
 def section_title(message: str, out: IO[bytes]) -> None:
     out.write(util_mod.underlined(message).encode())
 
@@ -108,9 +125,48 @@ def get_watchman_log_path() -> Optional[Path]:
     return None
 
 
+def _capture_output(func: Callable[[IO[bytes]], None]) -> bytes:
+    with io.BytesIO() as sink:
+        func(sink)
+        return sink.getvalue()
+
+
 def print_diagnostic_info(
     instance: EdenInstance, out: IO[bytes], dry_run: bool
 ) -> None:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        _print_diagnostic_info(instance, out, dry_run, executor)
+
+
+def _print_diagnostic_info(
+    instance: EdenInstance,
+    out: IO[bytes],
+    dry_run: bool,
+    executor: concurrent.futures.Executor,
+) -> None:
+    health_status = instance.check_health()
+    # assign to variable to make type checker happy :(
+    edenfs_instance_pid = health_status.pid if health_status.is_healthy() else None
+
+    # Most of these sections spend their time waiting on subprocesses or on
+    # the filesystem and do not depend on each other, so start them all up
+    # front and write out their output in the usual order as we get to it.
+    def submit(func: Callable[[IO[bytes]], None]) -> "concurrent.futures.Future[bytes]":
+        return executor.submit(_capture_output, func)
+
+    rpm_version = submit(print_rpm_version) if sys.platform != "win32" else None
+    os_version = submit(print_os_version)
+    log_tail = submit(
+        lambda sink: print_tail_of_log_file(instance.get_log_path(), sink)
+    )
+    running_processes = submit(print_running_eden_process)
+    process_tree = (
+        submit(lambda sink: print_edenfs_process_tree(edenfs_instance_pid, sink))
+        if edenfs_instance_pid is not None
+        else None
+    )
+    redirections = submit(lambda sink: print_eden_redirections(instance, sink))
+
     section_title("System info:", out)
     user = getpass.getuser()
     host = hostname_mod.get_normalized_hostname()
@@ -120,17 +176,16 @@ def print_diagnostic_info(
         f"Version                 : {version_mod.get_current_version()}\n"
     )
     out.write(header.encode())
-    if sys.platform != "win32":
+    if rpm_version is not None:
         # We attempt to report the RPM version on Linux as well as Mac, since Mac OS
         # can use RPMs as well.  If the RPM command fails this will just report that
         # and will continue reporting the rest of the rage data.
-        print_rpm_version(out)
-    print_os_version(out)
+        out.write(rpm_version.result())
+    out.write(os_version.result())
     if sys.platform == "darwin":
         cpu = "arm64" if util_mod.is_apple_silicon() else "x86_64"
         out.write(f"Architecture            : {cpu}\n".encode())
 
-    health_status = instance.check_health()
     if health_status.is_healthy():
         section_title("Build info:", out)
         debug_mod.do_buildinfo(instance, out)
@@ -171,31 +226,25 @@ def print_diagnostic_info(
             processor,
             out,
         )
-    print_tail_of_log_file(instance.get_log_path(), out)
-    print_running_eden_process(out)
+    out.write(log_tail.result())
+    out.write(running_processes.result())
     print_crashed_edenfs_logs(processor, out)
 
-    if health_status.is_healthy():
-        # assign to variable to make type checker happy :(
-        edenfs_instance_pid = health_status.pid
-        if edenfs_instance_pid is not None:
-            print_edenfs_process_tree(edenfs_instance_pid, out)
-            if not dry_run and processor:
-                trace_running_edenfs(processor, edenfs_instance_pid, out)
-
-    print_eden_redirections(instance, out)
+    if process_tree is not None and edenfs_instance_pid is not None:
+        out.write(process_tree.result())
+        if not dry_run and processor:
+            trace_running_edenfs(processor, edenfs_instance_pid, out)
+
+    out.write(redirections.result())
     section_title("List of mount points:", out)
-    mountpoint_paths = []
-    for key in sorted(instance.get_mount_paths()):
-        out.write(key.encode() + b"\n")
-        mountpoint_paths.append(key)
+    mountpoint_paths = sorted(instance.get_mount_paths())
+    out.write("".join(f"{key}\n" for key in mountpoint_paths).encode())
     mounts = instance.get_mounts()
     mounts_data = {
         mount.path.as_posix(): mount.to_json_dict() for mount in mounts.values()
     }
 
     for checkout_path in mountpoint_paths:
-        out.write(b"\nMount point info for path %s:\n" % checkout_path.encode())
         checkout_data = instance.get_checkout_info(checkout_path)
         mount_data = mounts_data.get(checkout_path, {})
         # "data_dir" in mount_data and "state_dir" in checkout_data are duplicates
@@ -203,8 +252,9 @@ def print_diagnostic_info(
             mount_data.pop("data_dir")
 
         checkout_data.update(mount_data)
-        for k, v in checkout_data.items():
-            out.write("{:>20} : {}\n".format(k, v).encode())
+        lines = [f"\nMount point info for path {checkout_path}:\n"]
+        lines.extend("{:>20} : {}\n".format(k, v) for k, v in checkout_data.items())
+        out.write("".join(lines).encode())
     if health_status.is_healthy():
         # TODO(zeyi): enable this when memory usage collecting is implemented on Windows
         with io.StringIO() as stats_stream:
@@ -244,7 +294,14 @@ def report_edenfs_bug(instance: EdenInstance, reporter: str) -> None:
     _report_edenfs_bug(rage_lambda, instance, reporter)
 
 
+# Most macOS and non-RPM Linux hosts have no rpm binary at all, and there is
+# no point spawning a process just to find that out.
+_HAS_RPM: bool = shutil.which("rpm") is not None
+
+
 def print_rpm_version(out: IO[bytes]) -> None:
+    if not _HAS_RPM:
+        return
     try:
         rpm_version = version_mod.get_installed_eden_rpm_version()
         out.write(f"RPM Version             : {rpm_version}\n".encode())
@@ -252,20 +309,21 @@ def print_rpm_version(out: IO[bytes]) -> None:
         out.write(f"Error getting the RPM version : {e}\n".encode())
 
 
-def print_os_version(out: IO[bytes]) -> None:
+# The human readable OS name in /etc/os-release.
+_PRETTY_NAME_RE: Pattern[str] = re.compile(r"^PRETTY_NAME=(.*)$", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_os_version() -> str:
+    # The OS version can't change while we are running.
     version = None
     if sys.platform == "linux":
         release_file_name = "/etc/os-release"
         if os.path.isfile(release_file_name):
             with open(release_file_name) as release_info_file:
-                release_info = {}
-                for line in release_info_file:
-                    parsed_line = line.rstrip().split("=")
-                    if len(parsed_line) == 2:
-                        release_info_piece, value = parsed_line
-                        release_info[release_info_piece] = value.strip('"')
-                if "PRETTY_NAME" in release_info:
-                    version = release_info["PRETTY_NAME"]
+                match = _PRETTY_NAME_RE.search(release_info_file.read())
+            if match:
+                version = match.group(1).rstrip().strip('"')
     elif sys.platform == "darwin":
         # While upstream Python correctly returns the macOS version number from
         # platform.mac_ver(), the version we're currently using incorrectly
@@ -289,31 +347,66 @@ def print_os_version(out: IO[bytes]) -> None:
 
     if not version:
         version = platform.system() + " " + platform.version()
+    return version
+
 
-    out.write(f"OS Version              : {version}\n".encode("utf-8"))
+def print_os_version(out: IO[bytes]) -> None:
+    out.write(f"OS Version              : {_get_os_version()}\n".encode("utf-8"))
 
 
 def print_eden_doctor_report(instance: EdenInstance, out: IO[bytes]) -> None:
-    doctor_output = io.StringIO()
     try:
-        doctor_rc = doctor_mod.cure_what_ails_you(
-            instance, dry_run=True, out=ui_mod.PlainOutput(doctor_output)
+        section_title("eden doctor --dry-run:", out)
+        # Encode the doctor report as it is produced rather than holding all of
+        # it in memory.  The exit code is only known at the end, so it follows
+        # the report instead of being part of the title.
+        doctor_output = io.TextIOWrapper(
+            cast(IO[bytes], out), encoding="utf-8", errors="replace", write_through=True
         )
-        doctor_report_title = f"eden doctor --dry-run (exit code {doctor_rc}):"
-        section_title(doctor_report_title, out)
-        out.write(doctor_output.getvalue().encode())
+        try:
+            doctor_rc = doctor_mod.cure_what_ails_you(
+                instance, dry_run=True, out=ui_mod.PlainOutput(doctor_output)
+            )
+        finally:
+            # Don't let the wrapper close out when it is garbage collected.
+            doctor_output.detach()
+        out.write(f"eden doctor exit code: {doctor_rc}\n".encode())
     except Exception:
         out.write(b"\nUnexpected exception thrown while running eden doctor checks:\n")
         out.write(traceback.format_exc().encode("utf-8") + b"\n")
 
 
-def read_chunk(logfile: IO[bytes]) -> Generator[bytes, None, None]:
-    CHUNK_SIZE = 20 * 1024
-    while True:
-        data = logfile.read(CHUNK_SIZE)
-        if not data:
-            break
-        yield data
+def _copy_log_data(logfile: IO[bytes], out: IO[bytes]) -> None:
+    """Copy everything from logfile's current position to the end into out.
+
+    On Linux, when out is backed by a file descriptor, the kernel copies the
+    data with sendfile() rather than bouncing it through our buffers.
+    """
+    if sys.platform == "linux":
+        try:
+            out_fd = out.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            out_fd = None
+        if out_fd is not None:
+            # Anything already written to out must go ahead of the log data.
+            out.flush()
+            in_fd = logfile.fileno()
+            offset = logfile.tell()
+            end = os.fstat(in_fd).st_size
+            try:
+                while offset < end:
+                    sent = os.sendfile(out_fd, in_fd, offset, end - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                return
+            except OSError as ex:
+                if ex.errno not in (errno.EINVAL, errno.ENOSYS):
+                    raise
+                # sendfile() does not support this kind of output; copy the
+                # rest the ordinary way.
+                logfile.seek(offset)
+    shutil.copyfileobj(logfile, out, 64 * 1024)
 
 
 def print_log_file(
@@ -323,20 +416,32 @@ def print_log_file(
         with path.open("rb") as logfile:
             if not whole_file:
                 LOG_AMOUNT = size
-                size = logfile.seek(0, io.SEEK_END)
+                size = os.fstat(logfile.fileno()).st_size
                 logfile.seek(max(0, size - LOG_AMOUNT), io.SEEK_SET)
-            for data in read_chunk(logfile):
-                out.write(data)
+            _copy_log_data(logfile, out)
     except Exception as e:
         out.write(b"Error reading the log file: %s\n" % str(e).encode())
 
 
+# Paste processors print "<str0>\n<str1>: <str2>\n" and we want str1.
+_PASTE_RE: Pattern[str] = re.compile(r"^.*\n[a-zA-Z0-9_.-]*: .*\n$")
+
+
+@functools.lru_cache(maxsize=8)
+def _split_processor(processor: str) -> Tuple[str, ...]:
+    # A single rage run pastes several sections with the same processor.
+    return tuple(shlex.split(processor))
+
+
 def paste_output(
     output_generator: Callable[[IO[bytes]], None], processor: str, out: IO[bytes]
 ) -> None:
     try:
         proc = subprocess.Popen(
-            shlex.split(processor), stdin=subprocess.PIPE, stdout=subprocess.PIPE
+            list(_split_processor(processor)),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            creationflags=_CREATION_FLAGS,
         )
         sink = cast(IO[bytes], proc.stdin)
         output = cast(IO[bytes], proc.stdout)
@@ -351,10 +456,7 @@ def paste_output(
             output.close()
             proc.wait()
 
-        # Expected output to be in form "<str0>\n<str1>: <str2>\n"
-        # and we want str1
-        pattern = re.compile("^.*\\n[a-zA-Z0-9_.-]*: .*\\n$")
-        match = pattern.match(stdout)
+        match = _PASTE_RE.match(stdout)
 
         if not match:
             out.write(stdout.encode())
@@ -370,16 +472,34 @@ def print_tail_of_log_file(path: Path, out: IO[bytes]) -> None:
         section_title("Most recent EdenFS logs:", out)
         LOG_AMOUNT = 20 * 1024
         with path.open("rb") as logfile:
-            size = logfile.seek(0, io.SEEK_END)
+            size = os.fstat(logfile.fileno()).st_size
             logfile.seek(max(0, size - LOG_AMOUNT), io.SEEK_SET)
-            data = logfile.read()
-            out.write(data)
+            _copy_log_data(logfile, out)
     except Exception as e:
         out.write(b"Error reading the log file: %s\n" % str(e).encode())
 
 
+def _parse_wmi_datetime(value: str) -> datetime:
+    # WMI reports times as "yyyymmddHHMMSS.ffffff+UUU"; slicing the fields out
+    # directly is much cheaper than datetime.strptime().
+    return datetime(
+        int(value[0:4]),
+        int(value[4:6]),
+        int(value[6:8]),
+        int(value[8:10]),
+        int(value[10:12]),
+        int(value[12:14]),
+        int(value[15:21]),
+    )
+
+
+# How long to wait for wmic to list processes, in seconds.
+_WMIC_TIMEOUT = 30
+
+
 def _get_running_eden_process_windows() -> List[Tuple[str, str, str, str, str, str]]:
-    output = subprocess.check_output(
+    # A wedged wmic shouldn't hang `eden rage` forever.
+    output = subprocess.run(
         [
             "wmic",
             "process",
@@ -388,14 +508,24 @@ def _get_running_eden_process_windows() -> List[Tuple[str, str, str, str, str, s
             "get",
             "processid,parentprocessid,creationdate,commandline",
             "/format:csv",
-        ]
-    )
-    reader = csv.reader(io.StringIO(output.decode().strip()))
-    next(reader)  # skip column header
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+        timeout=_WMIC_TIMEOUT,
+        creationflags=_CREATION_FLAGS,
+        encoding="utf-8",
+        errors="replace",
+    ).stdout
+    reader = csv.reader(output.splitlines())
     lines = []
+    # Measure every process's elapsed time against the same instant.
+    now = datetime.now()
     for line in reader:
-        start_time: datetime = datetime.strptime(line[2][:-4], "%Y%m%d%H%M%S.%f")
-        elapsed = str(datetime.now() - start_time)
+        # Skip the blank lines wmic emits and the column header.
+        if len(line) < 5 or not line[4].isdigit():
+            continue
+        start_time = _parse_wmi_datetime(line[2])
+        elapsed = str(now - start_time)
         # (pid, ppid, start_time, etime, comm)
         lines.append(
             (line[4], line[3], start_time.strftime("%b %d %H:%M"), elapsed, line[1])
@@ -403,6 +533,12 @@ def _get_running_eden_process_windows() -> List[Tuple[str, str, str, str, str, s
     return lines
 
 
+# A "pid ppid start etime comm" row from ps whose command mentions eden.
+_PS_EDEN_LINE_RE: Pattern[bytes] = re.compile(
+    rb"^[ \t]*(\d+)[ \t]+(\d+)[ \t]+(\S+)[ \t]+(\S+)[ \t]+(.*eden.*)$", re.MULTILINE
+)
+
+
 def print_running_eden_process(out: IO[bytes]) -> None:
     try:
         section_title("List of running EdenFS processes:", out)
@@ -417,8 +553,10 @@ def print_running_eden_process(out: IO[bytes]) -> None:
                 if sys.platform == "linux"
                 else ["ps", "-Awwx", "-eo", "pid,ppid,start,etime,comm"]
             )
-            output = output.decode()
-            lines = [line.split() for line in output.split("\n") if "eden" in line]
+            lines = [
+                tuple(field.decode() for field in match.groups())
+                for match in _PS_EDEN_LINE_RE.finditer(output)
+            ]
 
         format_str = "{:>20} {:>20} {:>20} {:>20} {}\n"
         out.write(
@@ -456,9 +594,9 @@ def print_eden_redirections(instance: EdenInstance, out: IO[bytes]) -> None:
         for checkout in checkouts:
             out.write(bytes(checkout.path) + b"\n")
             output = redirect_mod.prepare_redirection_list(checkout, instance)
-            # append a tab at the beginning of every new line to indent
-            output = output.replace("\n", "\n\t")
-            out.write(b"\t" + output.encode() + b"\n")
+            # Indent every line of the table with a tab.
+            for line in output.splitlines():
+                out.write(b"\t%s\n" % line.encode())
     except Exception as e:
         out.write(b"Error getting EdenFS redirections %s\n" % str(e).encode())
         out.write(traceback.format_exc().encode() + b"\n")
@@ -544,7 +682,8 @@ def print_prefetch_profiles_list(instance: EdenInstance, out: IO[bytes]) -> None
                     "list",
                     "--checkout",
                     f"{checkout.path}",
-                ]
+                ],
+                creationflags=_CREATION_FLAGS,
             )
             if profiles:
                 out.write(f"{checkout.path}:\n".encode())
@@ -680,7 +819,14 @@ def print_cdb_backtrace(pid: int, sink: IO[bytes]) -> None:
     env = os.environ.copy()
     env = setup_fb_env(env)
 
-    subprocess.run(cdb_cmd, check=True, stderr=subprocess.STDOUT, stdout=sink, env=env)
+    subprocess.run(
+        cdb_cmd,
+        check=True,
+        stderr=subprocess.STDOUT,
+        stdout=sink,
+        env=env,
+        creationflags=_CREATION_FLAGS,
+    )
 
 
 def print_sample_trace(pid: int, sink: IO[bytes]) -> None:
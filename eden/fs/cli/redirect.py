@@ -603,6 +603,10 @@ def get_effective_redirections(
     """
     redirs = {}
     checkout_path_bytes = bytes(checkout.path) + b"/"
+    # The checkout path ends in a separator, so decoding a mount point below it
+    # always yields a string that starts with the decoded checkout path.  This
+    # lets us decode each mount point only once.
+    checkout_path_len = len(os.fsdecode(checkout_path_bytes))
 
     nested_mounts = get_nested_mounts(instance, checkout_path_bytes)
 
@@ -613,7 +617,8 @@ def get_effective_redirections(
         ):
             continue
 
-        rel_path = os.fsdecode(mount_point[len(checkout_path_bytes) :])
+        mount_point_str = os.fsdecode(mount_point)
+        rel_path = mount_point_str[checkout_path_len:]
 
         # The is_bind_mount test may appear to be redundant but it is
         # possible for mounts to layer such that we have:
@@ -629,7 +634,7 @@ def get_effective_redirections(
         # We test whether we can see a mount point at that location
         # before recording it in the effective redirection list so
         # that we don't falsely believe that the bind mount is up.
-        if rel_path and is_bind_mount(Path(os.fsdecode(mount_point))):
+        if rel_path and is_bind_mount(Path(mount_point_str)):
             redirs[rel_path] = Redirection(
                 repo_path=Path(rel_path),
                 redir_type=RedirectionType.UNKNOWN,
@@ -7,12 +7,23 @@
 # pyre-unsafe
 
 import argparse
+import contextlib
 import io
 import logging
 import os
+import re
 import sys
-import textwrap
-from typing import cast, Dict, List, NamedTuple, Optional
+from typing import (
+    cast,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    TextIO,
+)
 
 from facebook.eden.constants import STATS_ALL, STATS_MOUNTS_STATS, STATS_RSS_BYTES
 from facebook.eden.ttypes import GetStatInfoParams
@@ -33,16 +44,63 @@ DiagInfoCounters = Dict[str, int]
 Table = Dict[str, List[int]]
 Table2D = Dict[str, List[List[Optional[str]]]]
 
+# fuse.<syscall>_us.count[.<period>]
+_FUSE_COUNT_RE: Pattern[str] = re.compile(
+    r"^fuse\.([^.]+)_us\.count(?:\.(60|600|3600))?$"
+)
+# fuse.<syscall>_us.<percentile>[.<period>]
+_FUSE_LATENCY_RE: Pattern[str] = re.compile(
+    r"^fuse\.([^.]+)_us\.(avg|p50|p90|p99)(?:\.(60|600|3600))?$"
+)
+
+# Column for each counter period suffix.  Counters without a suffix are all-time
+# values and go in the column after these.
+_PERIOD_INDEX: Dict[str, int] = {"60": 0, "600": 1, "3600": 2}
+_PERCENTILE_INDEX: Dict[str, int] = {"avg": 0, "p50": 1, "p90": 2, "p99": 3}
+
+# The frequently used io system calls shown by the fuse stats commands unless
+# --all is given.
+_IO_SYSCALLS: FrozenSet[str] = frozenset(
+    (
+        "open",
+        "read",
+        "write",
+        "symlink",
+        "readlink",
+        "mkdir",
+        "mknod",
+        "opendir",
+        "readdir",
+        "rmdir",
+    )
+)
+
 # TODO: https://github.com/python/typeshed/issues/1240
 stdoutWrapper: io.TextIOWrapper = cast(io.TextIOWrapper, sys.stdout)
 
 
 class StatsGeneralOptions(NamedTuple):
-    out: io.TextIOWrapper = stdoutWrapper
+    out: TextIO = stdoutWrapper
     basic: bool = False
     json: bool = False
 
 
+@contextlib.contextmanager
+def _buffered_stdout() -> Iterator[io.StringIO]:
+    """Collect a report in memory and write it to stdout in one go.
+
+    When stdout is a terminal it is line buffered, so writing a table row by
+    row costs one write(2) per line.  Whatever was rendered is still written
+    out if building the report fails part way through.
+    """
+    buf = io.StringIO()
+    try:
+        yield buf
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
 # Shows information like memory usage, list of mount points and number of inodes
 # loaded, unloaded, and materialized in the mount points, etc.
 def do_stats_general(instance: EdenInstance, options: StatsGeneralOptions) -> None:
@@ -56,10 +114,12 @@ def do_stats_general(instance: EdenInstance, options: StatsGeneralOptions) -> No
         json_factory = TSimpleJSONProtocolFactory()
         out.write(ThriftSerializer.serialize(json_factory, stat_info).decode("utf-8"))
     else:
-        print_stats(stat_info, out)
+        buf = io.StringIO()
+        print_stats(stat_info, buf)
+        out.write(buf.getvalue())
 
 
-def print_stats(stat_info, out: io.TextIOWrapper) -> None:
+def print_stats(stat_info, out: TextIO) -> None:
     private_bytes = (
         stats_print.format_size(stat_info.privateBytes)
         if stat_info.privateBytes is not None
@@ -110,24 +170,20 @@ def print_stats(stat_info, out: io.TextIOWrapper) -> None:
             duration = journal.durationSeconds
             if duration is None:
                 journalLine = (
-                    f"- Journal: {entries} entries "
+                    f"  - Journal: {entries} entries "
                     f"({stats_print.format_size(mem)})\n"
                 )
             else:
                 journalLine = (
-                    f"- Journal: {entries} entries over "
+                    f"  - Journal: {entries} entries over "
                     f"{stats_print.format_time(duration)} "
                     f"({stats_print.format_size(mem)})\n"
                 )
         out.write(
-            textwrap.dedent(
-                f"""\
-            {mount_path}
-              - Inodes in memory: {in_memory} ({trees} trees, {files} files)
-              - Unloaded, tracked inodes: {info.unloadedInodeCount}
-              {journalLine}
-            """
-            )
+            f"{mount_path}\n"
+            f"  - Inodes in memory: {in_memory} ({trees} trees, {files} files)\n"
+            f"  - Unloaded, tracked inodes: {info.unloadedInodeCount}\n"
+            f"{journalLine}\n"
         )
 
 
@@ -143,16 +199,18 @@ class FuseCmd(Subcmd):
         )
 
     def run(self, args: argparse.Namespace) -> int:
-        out = sys.stdout
-        stats_print.write_heading("Counts of I/O operations performed in EdenFs", out)
-        instance = cmd_util.get_eden_instance(args)
-        with instance.get_thrift_client_legacy() as client:
-            counters = client.getCounters()
+        with _buffered_stdout() as out:
+            stats_print.write_heading(
+                "Counts of I/O operations performed in EdenFs", out
+            )
+            instance = cmd_util.get_eden_instance(args)
+            with instance.get_thrift_client_legacy() as client:
+                counters = client.getRegexCounters("fuse\\..*")
 
-        # If the arguments has --all flag, we will have args.all set to
-        # true.
-        fuse_counters = get_fuse_counters(counters, args.all)
-        stats_print.write_table(fuse_counters, "SystemCall", out)
+            # If the arguments has --all flag, we will have args.all set to
+            # true.
+            fuse_counters = get_fuse_counters(counters, args.all)
+            stats_print.write_table(fuse_counters, "SystemCall", out)
 
         return 0
 
@@ -160,40 +218,24 @@ class FuseCmd(Subcmd):
 # Filters Fuse counters from all the counters in ServiceData and returns a
 # printable form of the information in a table. If all_flg is true we get the
 # counters for all the system calls, otherwise we get the counters of the
-# system calls which are present in the list syscalls, which is a list of
+# system calls which are present in _IO_SYSCALLS, which is a set of
 # frequently called io system calls.
 def get_fuse_counters(counters: DiagInfoCounters, all_flg: bool) -> Table:
     table: Table = {}
-    index = {"60": 0, "600": 1, "3600": 2}
-
-    # list of io system calls, if all flag is set we return counters for all the
-    # systems calls, else we return counters for io systemcalls.
-    syscalls = [
-        "open",
-        "read",
-        "write",
-        "symlink",
-        "readlink",
-        "mkdir",
-        "mknod",
-        "opendir",
-        "readdir",
-        "rmdir",
-    ]
-
-    for key in counters:
-        if key.startswith("fuse") and key.find(".count") >= 0:
-            tokens = key.split(".")
-            syscall = tokens[1][:-3]  # _us
-            if not all_flg and syscall not in syscalls:
-                continue
 
-            if syscall not in table.keys():
-                table[syscall] = [0, 0, 0, 0]
-            if len(tokens) == 3:
-                table[syscall][3] = int(counters[key])
-            else:
-                table[syscall][index[tokens[3]]] = int(counters[key])
+    for key, value in counters.items():
+        m = _FUSE_COUNT_RE.match(key)
+        if m is None:
+            continue
+        syscall, period = m.groups()
+        if not all_flg and syscall not in _IO_SYSCALLS:
+            continue
+
+        row = table.setdefault(syscall, [0, 0, 0, 0])
+        if period is None:
+            row[3] = int(value)
+        else:
+            row[_PERIOD_INDEX[period]] = int(value)
 
     return table
 
@@ -201,27 +243,24 @@ def get_fuse_counters(counters: DiagInfoCounters, all_flg: bool) -> Table:
 def insert_latency_record(
     table: Table2D, value: int, operation: str, percentile: str, period: Optional[str]
 ) -> None:
-    period_table = {"60": 0, "600": 1, "3600": 2}
-    percentile_table = {"avg": 0, "p50": 1, "p90": 2, "p99": 3}
-
     def with_microsecond_units(i: int) -> str:
         if i:
             return str(i) + " \u03BCs"  # mu for micro
         else:
             return str(i) + "   "
 
-    if operation not in table.keys():
+    if operation not in table:
         # pyre-ignore[6]: T38220626
         table[operation] = [
-            ["" for _ in range(len(percentile_table))]
-            for _ in range(len(period_table) + 1)
+            ["" for _ in range(len(_PERCENTILE_INDEX))]
+            for _ in range(len(_PERIOD_INDEX) + 1)
         ]
 
-    pct_index = percentile_table[percentile]
+    pct_index = _PERCENTILE_INDEX[percentile]
     if period:
-        period_index = period_table[period]
+        period_index = _PERIOD_INDEX[period]
     else:
-        period_index = len(period_table)
+        period_index = len(_PERIOD_INDEX)
 
     table[operation][pct_index][period_index] = with_microsecond_units(value)
 
@@ -243,48 +282,34 @@ class LatencyCmd(Subcmd):
 
     def run(self, args: argparse.Namespace) -> int:
         TITLE = "Latencies of I/O operations performed in EdenFS"
-        stats_print.write_heading(TITLE, sys.stdout)
+        with _buffered_stdout() as out:
+            stats_print.write_heading(TITLE, out)
 
-        instance = cmd_util.get_eden_instance(args)
-        with instance.get_thrift_client_legacy() as client:
-            counters = client.getCounters()
+            instance = cmd_util.get_eden_instance(args)
+            with instance.get_thrift_client_legacy() as client:
+                counters = client.getRegexCounters("fuse\\..*")
 
-        table = get_fuse_latency(counters, args.all)
-        stats_print.write_latency_table(table, sys.stdout)
+            table = get_fuse_latency(counters, args.all)
+            stats_print.write_latency_table(table, out)
 
         return 0
 
 
 # Returns all the latency information in ServiceData in a table format.
 # If all_flg is true we get the counters for all the system calls, otherwise we
-# get the counters of the system calls which are present in the list syscalls,
-# which is a list of frequently called io system calls.
+# get the counters of the system calls which are present in _IO_SYSCALLS,
+# which is a set of frequently called io system calls.
 def get_fuse_latency(counters: DiagInfoCounters, all_flg: bool) -> Table2D:
     table: Table2D = {}
-    syscalls = [
-        "open",
-        "read",
-        "write",
-        "symlink",
-        "readlink",
-        "mkdir",
-        "mknod",
-        "opendir",
-        "readdir",
-        "rmdir",
-    ]
 
-    for key in counters:
-        if key.startswith("fuse") and key.find(".count") == -1:
-            tokens = key.split(".")
-            syscall = tokens[1][:-3]
-            if not all_flg and syscall not in syscalls:
-                continue
-            percentile = tokens[2]
-            period = None
-            if len(tokens) > 3:
-                period = tokens[3]
-            insert_latency_record(table, counters[key], syscall, percentile, period)
+    for key, value in counters.items():
+        m = _FUSE_LATENCY_RE.match(key)
+        if m is None:
+            continue
+        syscall, percentile, period = m.groups()
+        if not all_flg and syscall not in _IO_SYSCALLS:
+            continue
+        insert_latency_record(table, value, syscall, percentile, period)
 
     return table
 
@@ -304,14 +329,15 @@ def get_fuse_latency(counters: DiagInfoCounters, all_flg: bool) -> Table2D:
 class HgImporterCmd(Subcmd):
     def run(self, args: argparse.Namespace) -> int:
         TITLE = "Counts of HgImporter requests performed in EdenFS"
-        stats_print.write_heading(TITLE, sys.stdout)
+        with _buffered_stdout() as out:
+            stats_print.write_heading(TITLE, out)
 
-        instance = cmd_util.get_eden_instance(args)
-        with instance.get_thrift_client_legacy() as client:
-            counters = client.getCounters()
+            instance = cmd_util.get_eden_instance(args)
+            with instance.get_thrift_client_legacy() as client:
+                counters = client.getRegexCounters("hg_importer\\..*")
 
-        table = get_counter_table(counters, ["hg_importer"], ["count"])
-        stats_print.write_table(table, "HgImporter Request", sys.stdout)
+            table = get_counter_table(counters, ["hg_importer"], ["count"])
+            stats_print.write_table(table, "HgImporter Request", out)
 
         return 0
 
@@ -320,16 +346,17 @@ class HgImporterCmd(Subcmd):
 class ThriftCmd(Subcmd):
     def run(self, args: argparse.Namespace) -> int:
         TITLE = "Counts of Thrift calls performed in EdenFS"
-        stats_print.write_heading(TITLE, sys.stdout)
+        with _buffered_stdout() as out:
+            stats_print.write_heading(TITLE, out)
 
-        instance = cmd_util.get_eden_instance(args)
-        with instance.get_thrift_client_legacy() as client:
-            counters = client.getRegexCounters("thrift.EdenService\\..*")
+            instance = cmd_util.get_eden_instance(args)
+            with instance.get_thrift_client_legacy() as client:
+                counters = client.getRegexCounters("thrift.EdenService\\..*")
 
-        PREFIX = ["thrift", "EdenService"]
-        SUFFIX = ["num_calls", "sum"]
-        table = get_counter_table(counters, PREFIX, SUFFIX)
-        stats_print.write_table(table, "Thrift Call", sys.stdout)
+            PREFIX = ["thrift", "EdenService"]
+            SUFFIX = ["num_calls", "sum"]
+            table = get_counter_table(counters, PREFIX, SUFFIX)
+            stats_print.write_table(table, "Thrift Call", out)
 
         return 0
 
@@ -338,21 +365,22 @@ class ThriftCmd(Subcmd):
 class ThriftLatencyCmd(Subcmd):
     def run(self, args: argparse.Namespace) -> int:
         TITLE = "Latency of Thrift processing time performed in EdenFS"
-        stats_print.write_heading(TITLE, sys.stdout)
+        with _buffered_stdout() as out:
+            stats_print.write_heading(TITLE, out)
 
-        instance = cmd_util.get_eden_instance(args)
-        with instance.get_thrift_client_legacy() as client:
-            counters = client.getCounters()
+            instance = cmd_util.get_eden_instance(args)
+            with instance.get_thrift_client_legacy() as client:
+                counters = client.getRegexCounters("thrift\\.EdenService\\..*")
 
-        table = get_thrift_latency(counters)
-        stats_print.write_latency_table(table, sys.stdout)
+            table = get_thrift_latency(counters)
+            stats_print.write_latency_table(table, out)
 
         return 0
 
 
 def get_thrift_latency(counters: DiagInfoCounters) -> Table2D:
     table: Table2D = {}
-    for key in counters:
+    for key, value in counters.items():
         if key.startswith("thrift.EdenService.") and key.find("time_process_us") != -1:
             tokens = key.split(".")
             if len(tokens) < 5:
@@ -362,7 +390,7 @@ def get_thrift_latency(counters: DiagInfoCounters) -> Table2D:
             period = None
             if len(tokens) > 5:
                 period = tokens[5]
-            insert_latency_record(table, counters[key], method, percentile, period)
+            insert_latency_record(table, value, method, percentile, period)
     return table
 
 
@@ -380,14 +408,15 @@ class MononokeBackingStoreLatencyCmd(Subcmd):
 
 def backing_store_latency(store: str, args: argparse.Namespace) -> int:
     TITLE = "Latency of {} backing store operations in EdenFs".format(store)
-    stats_print.write_heading(TITLE, sys.stdout)
+    with _buffered_stdout() as out:
+        stats_print.write_heading(TITLE, out)
 
-    instance = cmd_util.get_eden_instance(args)
-    with instance.get_thrift_client_legacy() as client:
-        counters = client.getCounters()
+        instance = cmd_util.get_eden_instance(args)
+        with instance.get_thrift_client_legacy() as client:
+            counters = client.getRegexCounters(f"store\\.{store}.*")
 
-    table = get_store_latency(counters, store)
-    stats_print.write_latency_table(table, sys.stdout)
+        table = get_store_latency(counters, store)
+        stats_print.write_latency_table(table, out)
 
     return 0
 
@@ -395,15 +424,16 @@ def backing_store_latency(store: str, args: argparse.Namespace) -> int:
 def get_store_latency(counters: DiagInfoCounters, store: str) -> Table2D:
     table: Table2D = {}
 
-    for key in counters:
-        if key.startswith("store.{}".format(store)) and key.find(".count") == -1:
+    store_prefix = "store.{}".format(store)
+    for key, value in counters.items():
+        if key.startswith(store_prefix) and key.find(".count") == -1:
             tokens = key.split(".")
             method = tokens[2]
             percentile = tokens[3]
             period = None
             if len(tokens) > 4:
                 period = tokens[4]
-            insert_latency_record(table, counters[key], method, percentile, period)
+            insert_latency_record(table, value, method, percentile, period)
     return table
 
 
@@ -422,48 +452,52 @@ class LocalStoreCmd(Subcmd):
             ("hgproxyhash", False),
         ]
 
-        out = sys.stdout
-        stats_print.write_heading("EdenFS Local Store Stats", out)
+        with _buffered_stdout() as out:
+            stats_print.write_heading("EdenFS Local Store Stats", out)
 
-        instance = cmd_util.get_eden_instance(args)
-        with instance.get_thrift_client_legacy() as client:
-            counters = client.getRegexCounters("local_store\\..*")
-
-        columns = ("Table", "Ephemeral?", "Size")
-        fmt = "{:<16} {:>10} {:>15}\n"
-        out.write(fmt.format(*columns))
-        out.write(f"-------------------------------------------\n")
-        for name, ephemeral in column_families:
-            size = stats_print.format_size(counters.get(f"local_store.{name}.size", 0))
-            out.write(fmt.format(name, "Y" if ephemeral else "N", size))
-
-        ephemeral_size = stats_print.format_size(
-            counters.get("local_store.ephemeral.total_size", 0)
-        )
-        persistent_size = stats_print.format_size(
-            counters.get("local_store.persistent.total_size", 0)
-        )
-        out.write("\n")
-        out.write(f"Total Ephemeral Size:  {ephemeral_size:>20}\n")
-        out.write(f"Total Persistent Size: {persistent_size:>20}\n")
-        out.write("\n")
-
-        out.write("Automatic Garbage Collection Data:\n")
-        out.write(f"-------------------------------------------\n")
-        auto_gc_running = bool(counters.get("local_store.auto_gc.running", 0))
-        out.write(f"Auto-GC In Progress:      {'Y' if auto_gc_running else 'N'}\n")
-        auto_gc_success = counters.get("local_store.auto_gc.success", 0)
-        out.write(f"Successful Auto-GC Runs:  {auto_gc_success}\n")
-        auto_gc_failure = counters.get("local_store.auto_gc.failure", 0)
-        out.write(f"Failed Auto-GC Runs:      {auto_gc_failure}\n")
-        last_gc_success = counters.get("local_store.auto_gc.last_run_succeeded", None)
-        if last_gc_success is not None:
-            last_gc_ms = counters.get("local_store.auto_gc.last_duration_ms", 0)
-            last_gc_sec = last_gc_ms / 1000
-
-            last_result_str = "Success" if last_gc_success == 1 else "Failure"
-            out.write(f"Last Auto-GC Result:      {last_result_str}\n")
-            out.write(f"Last Auto-GC Duration:    {last_gc_sec:.03f}s\n")
+            instance = cmd_util.get_eden_instance(args)
+            with instance.get_thrift_client_legacy() as client:
+                counters = client.getRegexCounters("local_store\\..*")
+
+            columns = ("Table", "Ephemeral?", "Size")
+            fmt = "{:<16} {:>10} {:>15}\n"
+            out.write(fmt.format(*columns))
+            out.write(f"-------------------------------------------\n")
+            for name, ephemeral in column_families:
+                size = stats_print.format_size(
+                    counters.get(f"local_store.{name}.size", 0)
+                )
+                out.write(fmt.format(name, "Y" if ephemeral else "N", size))
+
+            ephemeral_size = stats_print.format_size(
+                counters.get("local_store.ephemeral.total_size", 0)
+            )
+            persistent_size = stats_print.format_size(
+                counters.get("local_store.persistent.total_size", 0)
+            )
+            out.write("\n")
+            out.write(f"Total Ephemeral Size:  {ephemeral_size:>20}\n")
+            out.write(f"Total Persistent Size: {persistent_size:>20}\n")
+            out.write("\n")
+
+            out.write("Automatic Garbage Collection Data:\n")
+            out.write(f"-------------------------------------------\n")
+            auto_gc_running = bool(counters.get("local_store.auto_gc.running", 0))
+            out.write(f"Auto-GC In Progress:      {'Y' if auto_gc_running else 'N'}\n")
+            auto_gc_success = counters.get("local_store.auto_gc.success", 0)
+            out.write(f"Successful Auto-GC Runs:  {auto_gc_success}\n")
+            auto_gc_failure = counters.get("local_store.auto_gc.failure", 0)
+            out.write(f"Failed Auto-GC Runs:      {auto_gc_failure}\n")
+            last_gc_success = counters.get(
+                "local_store.auto_gc.last_run_succeeded", None
+            )
+            if last_gc_success is not None:
+                last_gc_ms = counters.get("local_store.auto_gc.last_duration_ms", 0)
+                last_gc_sec = last_gc_ms / 1000
+
+                last_result_str = "Success" if last_gc_success == 1 else "Failure"
+                out.write(f"Last Auto-GC Result:      {last_result_str}\n")
+                out.write(f"Last Auto-GC Duration:    {last_gc_sec:.03f}s\n")
 
         return 0
 
@@ -472,14 +506,15 @@ class LocalStoreCmd(Subcmd):
 class ObjectStoreCommand(Subcmd):
     def run(self, args: argparse.Namespace) -> int:
         TITLE = "Percentages of where data was found by the object store"
-        stats_print.write_heading(TITLE, sys.stdout)
+        with _buffered_stdout() as out:
+            stats_print.write_heading(TITLE, out)
 
-        eden = cmd_util.get_eden_instance(args)
-        with eden.get_thrift_client_legacy() as thrift:
-            counters = thrift.getRegexCounters("object_store\\..*")
+            eden = cmd_util.get_eden_instance(args)
+            with eden.get_thrift_client_legacy() as thrift:
+                counters = thrift.getRegexCounters("object_store\\..*")
 
-        table = get_counter_table(counters, ["object_store"], ["pct"])
-        stats_print.write_table(table, "Object Store", sys.stdout)
+            table = get_counter_table(counters, ["object_store"], ["pct"])
+            stats_print.write_table(table, "Object Store", out)
 
         return 0
 
@@ -487,12 +522,26 @@ class ObjectStoreCommand(Subcmd):
 def get_counter_table(counters: DiagInfoCounters, prefix: List, suffix: List) -> Table:
     table: Table = {}
 
-    for key in counters:
-        tags = key.split(".")
-        if tags[-len(suffix) :] == suffix and tags[0 : len(prefix)] == prefix:
-            TIME_SUFFIXES = (".60", ".600", ".3600", "")
-            row_name = ".".join(tags[len(prefix) : -len(suffix)])
-            table[row_name] = [counters[key + suffix] for suffix in TIME_SUFFIXES]
+    # Match on the dotted prefix and suffix strings instead of splitting every
+    # key; the windowed ".60"/".600"/".3600" counters fail the suffix check
+    # without any allocation.
+    key_prefix = ".".join(prefix) + "."
+    key_suffix = "." + ".".join(suffix)
+    min_len = len(key_prefix) + len(key_suffix)
+    for key, value in counters.items():
+        if (
+            len(key) > min_len
+            and key.endswith(key_suffix)
+            and key.startswith(key_prefix)
+        ):
+            row_name = key[len(key_prefix) : -len(key_suffix)]
+            # key is the all-time counter; the windowed ones share its name.
+            table[row_name] = [
+                counters[key + ".60"],
+                counters[key + ".600"],
+                counters[key + ".3600"],
+                value,
+            ]
 
     return table
 
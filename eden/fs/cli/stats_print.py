@@ -14,10 +14,11 @@ from typing import TextIO
 
 
 def write_heading(heading: str, out: TextIO) -> None:
-    border = "*" * len(heading)
-    out.write(_center_strip_right(border, 80))
-    out.write(_center_strip_right(heading, 80))
-    out.write(_center_strip_right(border, 80) + "\n")
+    # The border is as wide as the heading, so both center with the same
+    # padding.
+    padding = " " * ((80 - len(heading)) // 2)
+    border = padding + "*" * len(heading) + "\n"
+    out.write(border + padding + heading + "\n" + border + "\n")
 
 
 LATENCY_FORMAT_STR = "{:<12} {:^4} {:^10}  {:>10}  {:>15}  {:>10} {:>10}\n"
@@ -25,25 +26,25 @@ LATENCY_FORMAT_STR = "{:<12} {:^4} {:^10}  {:>10}  {:>15}  {:>10} {:>10}\n"
 
 # Prints a record of latencies with avg, 50'th,90'th and 99'th percentile.
 def write_latency_record(operation: str, matrix, out: TextIO) -> None:
-    border = "-" * 80
-    percentile = {0: "avg", 1: "p50", 2: "p90", 3: "p99"}
-
-    for i in range(len(percentile)):
-        operation_name = ""
-        if i == int(len(percentile) / 2):
-            operation_name = operation
-        out.write(
-            LATENCY_FORMAT_STR.format(
-                operation_name,
-                "|",
-                percentile[i],
-                matrix[i][0],
-                matrix[i][1],
-                matrix[i][2],
-                matrix[i][3],
-            )
+    percentiles = ("avg", "p50", "p90", "p99")
+    label_row = len(percentiles) // 2
+    format_row = LATENCY_FORMAT_STR.format
+
+    # Render the whole record and hand it to out in a single write.
+    lines = [
+        format_row(
+            operation if i == label_row else "",
+            "|",
+            percentile,
+            row[0],
+            row[1],
+            row[2],
+            row[3],
         )
-    out.write(border + "\n")
+        for i, (percentile, row) in enumerate(zip(percentiles, matrix))
+    ]
+    lines.append("-" * 80 + "\n")
+    out.write("".join(lines))
 
 
 def write_latency_table(table, out: TextIO) -> None:
@@ -67,46 +68,39 @@ def write_latency_table(table, out: TextIO) -> None:
 def write_table(table, heading: str, out: TextIO) -> None:
     key_width = max([len(heading)] + list(map(len, table.keys()))) + 2
 
-    format_str = "{:<{}}{:>15}{:>15}{:>15}{:>15}\n"
-    out.write(
-        format_str.format(
-            heading, key_width, "Last Minute", "Last 10m", "Last Hour", "All Time"
-        )
-    )
-    border = "-" * (key_width + 60)
-    out.write(border + "\n")
-    for key in table:
-        value = table[key]
-        out.write(
-            format_str.format(key, key_width, value[0], value[1], value[2], value[3])
-        )
+    # Pad cells with ljust/rjust rather than a width-spec format string, and
+    # emit the whole table with a single write.
+    def format_row(key: str, values) -> str:
+        return key.ljust(key_width) + "".join(str(v).rjust(15) for v in values)
 
+    lines = [
+        format_row(heading, ("Last Minute", "Last 10m", "Last Hour", "All Time")),
+        "-" * (key_width + 60),
+    ]
+    lines.extend(format_row(key, value[:4]) for key, value in table.items())
+    lines.append("")
+    out.write("\n".join(lines))
 
-def _center_strip_right(text: str, width: int) -> str:
-    """Returns a string with sufficient leading whitespace such that `text`
-    would be centered within the specified `width` plus a trailing newline."""
-    space = (width - len(text)) // 2
-    return space * " " + text + "\n"
+
+# (divisor, suffix) pairs for format_size(), largest unit first.
+_SIZE_UNITS = ((1000000000, "GB"), (1000000, "MB"), (1000, "KB"))
 
 
 def format_size(size: int) -> str:
-    if size > 1000000000:
-        return "{:.1f} GB".format(size / 1000000000)
-    if size > 1000000:
-        return "{:.1f} MB".format(size / 1000000)
-    if size > 1000:
-        return "{:.1f} KB".format(size / 1000)
+    for divisor, suffix in _SIZE_UNITS:
+        if size > divisor:
+            return "{:.1f} {}".format(size / divisor, suffix)
     if size > 0:
         return "{} B".format(size)
     return "0"
 
 
+# (seconds, suffix) pairs for format_time(), largest unit first.
+_TIME_UNITS = ((86400, "day(s)"), (3600, "hour(s)"), (60, "minute(s)"))
+
+
 def format_time(time: int) -> str:
-    if time >= 86400:
-        return "{:.1f} day(s)".format(time / 86400)
-    elif time >= 3600:
-        return "{:.1f} hour(s)".format(time / 3600)
-    elif time >= 60:
-        return "{:.1f} minute(s)".format(time / 60)
-    else:
-        return "{} second(s)".format(time)
+    for seconds, suffix in _TIME_UNITS:
+        if time >= seconds:
+            return "{:.1f} {}".format(time / seconds, suffix)
+    return "{} second(s)".format(time)
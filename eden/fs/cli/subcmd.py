@@ -8,6 +8,7 @@
 
 import abc
 import argparse
+import operator
 import typing
 from typing import Any, Awaitable, Callable, cast, Dict, List, Optional, Type, Union
 
@@ -24,6 +25,10 @@ class Subcmd(abc.ABC):
     DESCRIPTION: Optional[str] = None
     FORMATTER: Optional[argparse.HelpFormatter] = None
     ALIASES: Optional[List[str]] = None
+    # Whether main() should verify that the current working directory is not a
+    # stale mount point before running this command.  Commands that neither use
+    # the working directory nor run subprocesses in it can opt out.
+    REQUIRES_LIVE_CWD: bool = True
 
     def __init__(self, parser: argparse.ArgumentParser) -> None:
         # Save a pointer to the parent ArgumentParser that this Subcmd belongs
@@ -159,7 +164,7 @@ def add_subcommands(
     # single line with a single COMMAND placeholder.  We still render the nicer
     # list below where we would have shown the nasty one.
     subparsers = parser.add_subparsers(metavar="COMMAND")
-    for cmd_class in sorted(cmds, key=lambda c: c.NAME):
+    for cmd_class in sorted(cmds, key=operator.attrgetter("NAME")):
         # pyre-fixme[45]: Cannot instantiate abstract class `Subcmd`.
         cmd_instance = cmd_class(parser)
         cmd_instance.add_parser(subparsers)
@@ -199,11 +204,11 @@ def do_help(parser: argparse.ArgumentParser, help_args: List[str]) -> int:
         subparser = subcmds.choices.get(arg, None)
         if not subparser:
             if idx == 0:
-                util.print_stderr('error: unknown command "{}"', arg)
+                util.print_stderr(f'error: unknown command "{arg}"')
             else:
                 cmd_so_far = " ".join(help_args[:idx])
                 util.print_stderr(
-                    'error: "{}" does not have a subcommand "{}"', cmd_so_far, arg
+                    f'error: "{cmd_so_far}" does not have a subcommand "{arg}"'
                 )
             return 2
 
@@ -215,6 +220,8 @@ def do_help(parser: argparse.ArgumentParser, help_args: List[str]) -> int:
 
 @subcmd("help", "Display command line usage information")
 class HelpCmd(Subcmd):
+    REQUIRES_LIVE_CWD = False
+
     def setup_parser(self, parser: argparse.ArgumentParser) -> None:
         parser.add_argument("args", nargs="*")
 
@@ -6,10 +6,14 @@
 
 # pyre-strict
 
+import io
+import threading
 import unittest
 from pathlib import Path
+from typing import List, Tuple
+from unittest.mock import MagicMock, patch
 
-from eden.fs.cli import main as main_mod
+from eden.fs.cli import buck as buck_mod, main as main_mod
 from eden.fs.cli.config import (
     CheckoutConfig,
     DEFAULT_REVISION,
@@ -574,3 +578,108 @@ class ListTest(unittest.TestCase):
 """,
             json_out.getvalue(),
         )
+
+
+class StopAuxProcessesTest(unittest.TestCase):
+    repos: List[str] = [f"/repo{i}" for i in range(6)]
+
+    def run_stop_aux_processes(
+        self, failing_project: str = ""
+    ) -> Tuple[int, List[str], List[Tuple[str, str]], str, str]:
+        projects = {
+            repo: [f"{repo}/project{j}" for j in range(6)] for repo in self.repos
+        }
+        client = MagicMock()
+        client.listMounts.return_value = [
+            MountInfo(mountPoint=repo.encode()) for repo in self.repos
+        ]
+
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        killed: List[str] = []
+        # Hold every kill until a full pool's worth of them are running at
+        # once, so the peak doesn't depend on how the threads get scheduled.
+        pool_full = threading.Event()
+
+        def kill(project: str) -> None:
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                killed.append(project)
+                if running[0] >= buck_mod._MAX_BUCK_PROCESSES:
+                    pool_full.set()
+            pool_full.wait(timeout=30)
+            with lock:
+                running[0] -= 1
+            if project == failing_project:
+                raise RuntimeError("buck kill failed")
+
+        steps: List[Tuple[str, str]] = []
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with patch.object(
+            buck_mod, "find_running_buckd_projects", side_effect=projects.__getitem__
+        ), patch.object(buck_mod, "_kill_buckd", side_effect=kill), patch.object(
+            main_mod,
+            "unmount_redirections_for_path",
+            side_effect=lambda repo, complain_about_failing_to_unmount_redirs: (
+                steps.append(("unmount", repo))
+            ),
+        ), patch.object(
+            main_mod,
+            "stop_internal_processes",
+            side_effect=lambda repo: steps.append(("internal", repo)),
+        ), patch(
+            "sys.stdout", stdout
+        ), patch(
+            "sys.stderr", stderr
+        ):
+            main_mod.stop_aux_processes(client)
+
+        self.assertCountEqual(
+            [project for repo in self.repos for project in projects[repo]], killed
+        )
+        return peak[0], killed, steps, stdout.getvalue(), stderr.getvalue()
+
+    def test_buck_kills_share_one_bounded_pool(self) -> None:
+        peak, _killed, steps, stdout, stderr = self.run_stop_aux_processes()
+        # Every repository's projects go through the same pool, so there are
+        # never more buck kills running than a single pool allows.
+        self.assertEqual(buck_mod._MAX_BUCK_PROCESSES, peak)
+        self.assertEqual(
+            [(step, repo) for repo in self.repos for step in ("unmount", "internal")],
+            steps,
+        )
+        self.assertEqual(
+            "".join(
+                f"Stopping buck in {repo}/project{j}...\n"
+                for repo in self.repos
+                for j in range(6)
+            ),
+            stdout,
+        )
+        self.assertEqual("", stderr)
+
+    def test_buck_failure_is_reported_for_its_repo(self) -> None:
+        _peak, _killed, steps, stdout, stderr = self.run_stop_aux_processes(
+            failing_project="/repo2/project3"
+        )
+        self.assertEqual(
+            [
+                (step, repo)
+                for repo in self.repos
+                if repo != "/repo2"
+                for step in ("unmount", "internal")
+            ],
+            steps,
+        )
+        self.assertIn(
+            "Failed to kill buck. Please manually run `buck kill` in "
+            "`/repo2/project3`",
+            stdout,
+        )
+        self.assertEqual(
+            "error stopping auxiliary processes for /repo2: buck kill failed\n",
+            stderr,
+        )
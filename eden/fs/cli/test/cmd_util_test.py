@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This software may be used and distributed according to the terms of the
+# GNU General Public License version 2.
+
+# pyre-strict
+
+import io
+import os
+import select
+import sys
+import unittest
+from typing import List, Tuple
+from unittest.mock import patch
+
+from .. import cmd_util
+
+
+class _KeystrokeFeeder(io.StringIO):
+    """Fake stdout that types the next chunk of input whenever a prompt is
+    flushed, so each keystroke arrives after the terminal is in cbreak mode."""
+
+    def __init__(self, master_fd: int, keystrokes: List[bytes]) -> None:
+        super().__init__()
+        self.master_fd = master_fd
+        self.keystrokes = keystrokes
+
+    def flush(self) -> None:
+        if self.keystrokes:
+            os.write(self.master_fd, self.keystrokes.pop(0))
+
+
+@unittest.skipIf(sys.platform == "win32", "termios is not available on Windows")
+class PromptConfirmationTtyTest(unittest.TestCase):
+    def setUp(self) -> None:
+        import pty
+
+        self.master_fd, slave_fd = pty.openpty()
+        self.addCleanup(os.close, self.master_fd)
+        self.stdin = os.fdopen(slave_fd, "r")
+        self.addCleanup(self.stdin.close)
+
+    def prompt(self, keystrokes: List[bytes]) -> Tuple[bool, str]:
+        stdout = _KeystrokeFeeder(self.master_fd, keystrokes)
+        with patch.object(sys, "stdin", self.stdin), patch.object(
+            sys, "stdout", stdout
+        ):
+            answer = cmd_util.prompt_confirmation("Proceed?")
+        return answer, stdout.getvalue()
+
+    def assert_no_pending_input(self) -> None:
+        readable, _, _ = select.select([self.stdin], [], [], 0.1)
+        self.assertEqual([], readable)
+
+    def test_single_key_answers(self) -> None:
+        for key, expected in [
+            (b"y", True),
+            (b"Y", True),
+            (b"n", False),
+            (b"N", False),
+            (b"\n", False),
+        ]:
+            with self.subTest(key=key):
+                answer, output = self.prompt([key])
+                self.assertEqual(expected, answer)
+                self.assertEqual(
+                    "Proceed? [y/N] " + ("yes" if expected else "no") + "\n", output
+                )
+
+    def test_typed_ahead_input_is_discarded(self) -> None:
+        answer, output = self.prompt([b"yes\n"])
+        self.assertTrue(answer)
+        self.assertEqual("Proceed? [y/N] yes\n", output)
+        # The "es\n" following the "y" must not be left for the shell to read.
+        self.assert_no_pending_input()
+
+    def test_unrecognized_key_prompts_again(self) -> None:
+        answer, output = self.prompt([b"x", b"n"])
+        self.assertFalse(answer)
+        self.assertEqual(
+            'Proceed? [y/N] x\nPlease enter "yes" or "no"\nProceed? [y/N] no\n',
+            output,
+        )
+        self.assert_no_pending_input()
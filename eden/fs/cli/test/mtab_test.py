@@ -57,3 +57,18 @@ eden@osxfuse0 on /Users/wez/fbsource (osxfuse_eden, nosuid, synchronous)
             ],
             parse_macos_mount_output(contents),
         )
+
+    def test_parse_mtab_macos_options_without_comma(self) -> None:
+        # A line with a single option must not run into the line after it.
+        contents = b"""\
+/dev/disk1 on / (apfs, local)
+weird on /x (nfs)
+/dev/disk2 on /y (apfs, local)
+"""
+        self.assertEqual(
+            [
+                MountInfo(device=b"/dev/disk1", mount_point=b"/", vfstype=b"apfs"),
+                MountInfo(device=b"/dev/disk2", mount_point=b"/y", vfstype=b"apfs"),
+            ],
+            parse_macos_mount_output(contents),
+        )
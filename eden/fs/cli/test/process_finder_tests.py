@@ -8,6 +8,7 @@
 
 import datetime
 import shutil
+import sys
 import tempfile
 import time
 import unittest
@@ -15,7 +16,7 @@ from datetime import timedelta
 from pathlib import Path
 from typing import Optional
 
-from eden.fs.cli.proc_utils import BuildInfo, EdenFSProcess
+from eden.fs.cli.proc_utils import BuildInfo, EdenFSProcess, LinuxProcUtils
 from eden.fs.cli.test.lib.fake_proc_utils import FakeProcUtils
 
 
@@ -164,3 +165,33 @@ class ProcUtilsTests(unittest.TestCase):
         self.assertFalse(self.proc_utils.is_edenfs_process(1111))
         self.assertFalse(self.proc_utils.is_edenfs_process(7868))
         self.assertFalse(self.proc_utils.is_edenfs_process(9999))
+
+
+@unittest.skipIf(sys.platform != "linux", "/proc is only used on Linux")
+class LinuxProcUtilsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp(prefix="eden_test."))
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.proc_utils = LinuxProcUtils()
+        self.proc_utils.proc_path = self.tmpdir
+
+    def add_comm(self, pid: int, comm: bytes) -> None:
+        pid_dir = self.tmpdir / str(pid)
+        pid_dir.mkdir()
+        (pid_dir / "comm").write_bytes(comm)
+
+    def test_get_process_command_reads_proc_comm(self) -> None:
+        self.add_comm(1234, b"edenfs\n")
+        self.add_comm(1111, b"sleep\n")
+
+        self.assertEqual("edenfs", self.proc_utils._get_process_command(1234))
+        self.assertEqual("sleep", self.proc_utils._get_process_command(1111))
+        self.assertIsNone(self.proc_utils._get_process_command(9999))
+
+    def test_is_edenfs_process(self) -> None:
+        self.add_comm(1234, b"edenfs\n")
+        self.add_comm(1111, b"sleep\n")
+
+        self.assertTrue(self.proc_utils.is_edenfs_process(1234))
+        self.assertFalse(self.proc_utils.is_edenfs_process(1111))
+        self.assertFalse(self.proc_utils.is_edenfs_process(9999))
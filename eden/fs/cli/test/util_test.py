@@ -8,6 +8,8 @@
 
 import os
 import stat
+import sys
+import tempfile
 import unittest
 
 from facebook.eden.ttypes import TreeInodeDebugInfo, TreeInodeEntryDebugInfo
@@ -29,6 +31,37 @@ class UtilTest(unittest.TestCase):
         self.assertFalse(is_valid("abc"))
         self.assertFalse(is_valid("z" * 40))
 
+    @unittest.skipIf(sys.platform == "win32", ".eden only exists at the root")
+    def test_is_eden_mount(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertFalse(util.is_eden_mount(tmp))
+
+            file_path = os.path.join(tmp, "file")
+            with open(file_path, "w"):
+                pass
+            # Files are deferred to get_eden_mount_name(), which checks the
+            # parent directory.
+            self.assertTrue(util.is_eden_mount(file_path))
+
+            os.mkdir(os.path.join(tmp, ".eden"))
+            self.assertTrue(util.is_eden_mount(tmp))
+
+    @unittest.skipIf(sys.platform == "win32", ".eden only exists at the root")
+    def test_get_eden_mount_name(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            file_path = os.path.join(tmp, "file")
+            with open(file_path, "w"):
+                pass
+            with self.assertRaises(util.NotAnEdenMountError):
+                util.get_eden_mount_name(tmp)
+            with self.assertRaises(util.NotAnEdenMountError):
+                util.get_eden_mount_name(file_path)
+
+            os.mkdir(os.path.join(tmp, ".eden"))
+            os.symlink("/path/to/checkout", os.path.join(tmp, ".eden", "root"))
+            self.assertEqual("/path/to/checkout", util.get_eden_mount_name(tmp))
+            self.assertEqual("/path/to/checkout", util.get_eden_mount_name(file_path))
+
     INODE_RESULTS_0 = [
         TreeInodeDebugInfo(
             inodeNumber=1,
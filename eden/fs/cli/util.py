@@ -22,7 +22,16 @@ import sys
 import time
 import typing
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, TypeVar
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    TYPE_CHECKING,
+    TypeVar,
+    Union,
+)
 
 import thrift.transport
 from eden.thrift.legacy import EdenClient, EdenNotRunningError
@@ -62,6 +71,10 @@ class NotAnEdenMountError(Exception):
         return f"{self.path} does not appear to be inside an EdenFS checkout"
 
 
+# Names of the fb303_status values, used when describing a daemon's health.
+_STATUS_NAMES: Dict[int, str] = fb303_status._VALUES_TO_NAMES
+
+
 class HealthStatus(object):
     def __init__(
         self,
@@ -83,7 +96,7 @@ class HealthStatus(object):
 
     def __str__(self) -> str:
         return "(%s, pid=%s, uptime=%s, detail=%r)" % (
-            fb303_status._VALUES_TO_NAMES.get(self.status, str(self.status)),
+            _STATUS_NAMES.get(self.status, str(self.status)),
             self.pid,
             self.uptime,
             self.detail,
@@ -98,30 +111,38 @@ def poll_until(
     timeout: float,
     interval: float = 0.2,
     timeout_ex: Optional[Exception] = None,
+    max_interval: Optional[float] = None,
 ) -> T:
     """
     Call the specified function repeatedly until it returns non-None.
     Returns the function result.
 
-    Sleep 'interval' seconds between calls.  If 'timeout' seconds passes
+    Sleep 'interval' seconds between calls.  If 'max_interval' is supplied the
+    sleep time doubles after each call, up to 'max_interval' seconds, so that
+    conditions which become true quickly are noticed quickly without spinning
+    on ones that take longer.  If 'timeout' seconds passes
     before the function returns a non-None result, raise an exception.
     If a 'timeout_ex' argument is supplied, that exception object is
     raised, otherwise a TimeoutError is raised.
     """
-    end_time = time.time() + timeout
+    end_time = time.monotonic() + timeout
     while True:
         result = function()
         if result is not None:
             return result
 
-        if time.time() >= end_time:
+        now = time.monotonic()
+        if now >= end_time:
             if timeout_ex is not None:
                 raise timeout_ex
             raise TimeoutError(
                 "timed out waiting on function {}".format(function.__name__)
             )
 
-        time.sleep(interval)
+        # Don't sleep past the deadline; make one last call right at it.
+        time.sleep(min(interval, end_time - now))
+        if max_interval is not None:
+            interval = min(interval * 2, max_interval)
 
 
 def get_pid_using_lockfile(config_dir: Path) -> int:
@@ -136,9 +157,22 @@ def get_pid_using_lockfile(config_dir: Path) -> int:
         # file.
         lockfile = config_dir / LOCK_FILE
 
-    with lockfile.open("r") as f:
-        lockfile_contents = f.read()
-    return int(lockfile_contents.rstrip())
+    return read_pid_file(lockfile)
+
+
+def read_pid_file(path: "Union[str, os.PathLike[str]]") -> int:
+    """Read a process ID from a file containing just the PID, throwing an
+    exception if it cannot be read or parsed.
+
+    These files are tiny and may be read repeatedly while polling a daemon, so
+    this reads the raw bytes rather than going through a buffered text file.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        contents = os.read(fd, 64)
+    finally:
+        os.close(fd)
+    return int(contents.strip())
 
 
 def check_health_using_lockfile(config_dir: Path) -> HealthStatus:
@@ -214,7 +248,7 @@ def check_health(
         detail = "error talking to edenfs: " + str(ex)
         return HealthStatus(status, pid, uptime, detail)
 
-    status_name = fb303_status._VALUES_TO_NAMES.get(status)
+    status_name = _STATUS_NAMES.get(status)
     detail = "edenfs running (pid {}); status is {}".format(pid, status_name)
     return HealthStatus(status, pid, uptime, detail)
 
@@ -295,10 +329,17 @@ def get_home_dir() -> Path:
     else:
         home_dir = os.getenv("HOME")
         if not home_dir:
-            home_dir = pwd.getpwuid(os.getuid()).pw_dir
+            home_dir = _get_passwd_home_dir()
     return Path(home_dir)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_passwd_home_dir() -> str:
+    # getpwuid() may have to query a remote name service, and the answer for our
+    # own uid won't change while we run.  $HOME is still consulted on every call.
+    return pwd.getpwuid(os.getuid()).pw_dir
+
+
 def mkdir_p(path: str) -> str:
     """Performs `mkdir -p <path>` and returns the path."""
     try:
@@ -339,6 +380,20 @@ class Repo(abc.ABC):
         pass
 
 
+@functools.lru_cache(maxsize=None)
+def _get_hg_env() -> Dict[str, str]:
+    """The environment to run hg commands in.  This is computed once and shared
+    by every HgRepo, so it must not be modified."""
+    env = os.environ.copy()
+    env["HGPLAIN"] = "1"
+
+    # These are set by the par machinery and interfere with Mercurial's
+    # own dynamic library loading.
+    env.pop("DYLD_INSERT_LIBRARIES", None)
+    env.pop("DYLD_LIBRARY_PATH", None)
+    return env
+
+
 class HgRepo(Repo):
     HEAD = "."
 
@@ -346,13 +401,7 @@ class HgRepo(Repo):
         super(HgRepo, self).__init__(
             "hg", source, source if working_dir is None else working_dir
         )
-        self._env = os.environ.copy()
-        self._env["HGPLAIN"] = "1"
-
-        # These are set by the par machinery and interfere with Mercurial's
-        # own dynamic library loading.
-        self._env.pop("DYLD_INSERT_LIBRARIES", None)
-        self._env.pop("DYLD_LIBRARY_PATH", None)
+        self._env = _get_hg_env()
 
         # Find the path to hg.
         # The EDEN_HG_BINARY environment variable is normally set when running
@@ -365,12 +414,9 @@ class HgRepo(Repo):
 
     def _run_hg(self, args: List[str], stderr_output=None) -> bytes:
         cmd = [self._hg_binary] + args
-        out_bytes = subprocess.check_output(
+        return subprocess.check_output(
             cmd, cwd=self.working_dir, env=self._env, stderr=stderr_output
         )
-        # pyre-fixme[22]: The cast is redundant.
-        out = typing.cast(bytes, out_bytes)
-        return out
 
     def get_commit_hash(self, commit: str, stderr_output=None) -> str:
         out = self._run_hg(["log", "-r", commit, "-T{node}"], stderr_output)
@@ -388,9 +434,7 @@ class GitRepo(Repo):
 
     def _run_git(self, args: List[str]) -> bytes:
         cmd = ["git"] + args
-        # pyre-fixme[22]: The cast is redundant.
-        out = typing.cast(bytes, subprocess.check_output(cmd, cwd=self.source))
-        return out
+        return subprocess.check_output(cmd, cwd=self.source)
 
     def get_commit_hash(self, commit: str) -> str:
         out = self._run_git(["rev-parse", commit])
@@ -438,11 +482,28 @@ def mkscratch_bin() -> Path:
 
 
 def is_git_dir(path: str) -> bool:
-    return (
-        os.path.isdir(os.path.join(path, "objects"))
-        and os.path.isdir(os.path.join(path, "refs"))
-        and os.path.exists(os.path.join(path, "HEAD"))
-    )
+    # A single directory scan answers all three checks from the entry types,
+    # rather than stat()ing objects/, refs/ and HEAD separately.
+    missing = {"objects", "refs", "HEAD"}
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name not in missing:
+                    continue
+                if name == "HEAD":
+                    # HEAD only needs to exist, but a dangling symlink does not.
+                    found = not entry.is_symlink() or os.path.exists(entry.path)
+                else:
+                    found = entry.is_dir()
+                if not found:
+                    return False
+                missing.remove(name)
+                if not missing:
+                    return True
+    except OSError:
+        pass
+    return False
 
 
 def _get_git_repo(path: str) -> Optional[GitRepo]:
@@ -469,7 +530,12 @@ def get_hg_repo(path: str) -> Optional[HgRepo]:
     working_dir = path
     from . import hg_util
 
-    hg_dir = os.path.join(repo_path, hg_util.sniff_dot_dir(Path(path)))
+    # Walking up from a path in get_repo() probes many directories that are not
+    # repositories, so bail out as soon as there is no dot dir at all.
+    dot_dir = hg_util.find_dot_dir(Path(path))
+    if dot_dir is None:
+        return None
+    hg_dir = os.path.join(repo_path, dot_dir)
     if not os.path.isdir(hg_dir):
         return None
 
@@ -538,26 +604,73 @@ def get_repo(path: str, backing_store_type: Optional[str] = None) -> Optional[Re
         path = parent
 
 
-def print_stderr(message: str, *args: Any, **kwargs: Any) -> None:
+def print_stderr(message: str) -> None:
     """Prints the message to stderr."""
-    if args or kwargs:
-        message = message.format(*args, **kwargs)
     print(message, file=sys.stderr)
 
 
+# The largest pipe buffer an unprivileged process can request with the default
+# /proc/sys/fs/pipe-max-size setting.
+MAX_PIPE_BUFFER_SIZE = 1024 * 1024
+
+
+def grow_pipe_buffer(pipe: typing.IO[bytes], size: int = MAX_PIPE_BUFFER_SIZE) -> None:
+    """Make a best-effort attempt to enlarge the kernel buffer backing a pipe.
+
+    With the default 64KB buffer a writer producing a large report stalls
+    whenever the reader falls behind.  A larger buffer lets us keep generating
+    output while the reader catches up.  This is a no-op on platforms that do
+    not support resizing pipes.
+    """
+    if sys.platform != "linux":
+        return
+
+    import fcntl
+
+    # fcntl.F_SETPIPE_SZ is only exposed by Python 3.10+.
+    set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+    try:
+        fcntl.fcntl(pipe.fileno(), set_pipe_size, size)
+    except OSError:
+        # EPERM if size exceeds the system limit, or EBUSY if the pipe already
+        # holds more data than would fit.  Keep using the default buffer.
+        pass
+
+
 def stack_trace() -> str:
     import traceback
 
     return "".join(traceback.format_stack())
 
 
+_SHA1_HEX_RE: Pattern[str] = re.compile(r"[0-9a-fA-F]{40}")
+
+
 def is_valid_sha1(sha1: str) -> bool:
     """True iff sha1 is a valid 40-character SHA1 hex string."""
-    if sha1 is None or len(sha1) != 40:
-        return False
-    import string
+    return sha1 is not None and _SHA1_HEX_RE.fullmatch(sha1) is not None
+
+
+def is_eden_mount(path: str) -> bool:
+    """
+    Cheaply check whether the specified path may be inside an EdenFS checkout.
 
-    return set(sha1).issubset(string.hexdigits)
+    This never raises: it returns False only when the path definitely has no
+    .eden directory, so callers can skip get_eden_mount_name() for plain
+    directories without paying for a NotAnEdenMountError.
+    """
+    if sys.platform == "win32":
+        # .eden only exists at the root of Windows checkouts, so subdirectories
+        # cannot be ruled out here.
+        return True
+    try:
+        os.stat(os.path.join(path, ".eden"))
+    except FileNotFoundError:
+        return False
+    except OSError:
+        # ENOTDIR, ENOTCONN and friends are handled by get_eden_mount_name().
+        return True
+    return True
 
 
 def get_eden_mount_name(path_arg: str) -> str:
@@ -572,58 +685,54 @@ def get_eden_mount_name(path_arg: str) -> str:
                 return os.path.realpath(path)
             from . import hg_util
 
-            if os.path.exists(os.path.join(path, hg_util.sniff_dot_dir(Path(path)))):
+            if hg_util.find_dot_dir(Path(path)) is not None:
                 break
             path = parent
             parent = os.path.dirname(path)
 
         raise NotAnEdenMountError(path_arg)
     else:
-        path = os.path.join(path_arg, ".eden", "root")
         try:
-            return os.readlink(path)
+            return os.readlink(os.path.join(path_arg, ".eden", "root"))
         except OSError as ex:
-            if ex.errno == errno.ENOTDIR:
-                path = os.path.join(os.path.dirname(path_arg), ".eden", "root")
-                return os.readlink(path)
-            elif ex.errno == errno.ENOENT:
+            if ex.errno == errno.ENOENT:
                 raise NotAnEdenMountError(path_arg)
-            raise
+            elif ex.errno != errno.ENOTDIR:
+                raise
+
+        # path_arg is not a directory, so look for .eden next to it instead.
+        # Trying the directory case first costs files one failed readlink(),
+        # whereas checking the file type up front would cost every call an
+        # extra lstat().
+        try:
+            return os.readlink(os.path.join(os.path.dirname(path_arg), ".eden", "root"))
+        except FileNotFoundError:
+            raise NotAnEdenMountError(path_arg)
 
 
 def get_username() -> str:
     return getpass.getuser()
 
 
-class LoadedNode(typing.NamedTuple):
-    path: str
-    is_write: bool
-    file_size: int
-
-
-def make_loaded_node(path: str, is_write: bool, file_size: Optional[int]) -> LoadedNode:
-    assert file_size is not None, "File should have associated file size"
-    return LoadedNode(path=path, is_write=is_write, file_size=file_size)
-
-
 def split_inodes_by_operation_type(
     inode_results: typing.Sequence[TreeInodeDebugInfo],
 ) -> typing.Tuple[
     typing.List[typing.Tuple[str, int]], typing.List[typing.Tuple[str, int]]
 ]:
-    loaded_node_info = [
-        make_loaded_node(
-            path=os.path.join(os.fsdecode(tree.path), os.fsdecode(n.name)),
-            is_write=n.materialized or not n.hash,
-            file_size=n.fileSize,
-        )
-        for tree in inode_results
-        for n in tree.entries
-        if n.loaded and stat.S_IFMT(n.mode) == stat.S_IFREG
-    ]
-
-    read_files = [(o.path, o.file_size) for o in loaded_node_info if not o.is_write]
-    written_files = [(o.path, o.file_size) for o in loaded_node_info if o.is_write]
+    read_files: typing.List[typing.Tuple[str, int]] = []
+    written_files: typing.List[typing.Tuple[str, int]] = []
+    for tree in inode_results:
+        tree_path = os.fsdecode(tree.path)
+        for n in tree.entries:
+            if not n.loaded or stat.S_IFMT(n.mode) != stat.S_IFREG:
+                continue
+            file_size = n.fileSize
+            assert file_size is not None, "File should have associated file size"
+            entry = (os.path.join(tree_path, os.fsdecode(n.name)), file_size)
+            if n.materialized or not n.hash:
+                written_files.append(entry)
+            else:
+                read_files.append(entry)
     return read_files, written_files
 
 
@@ -708,7 +817,10 @@ def is_sandcastle() -> bool:
     return "SANDCASTLE" in os.environ
 
 
+@functools.lru_cache(maxsize=None)
 def is_apple_silicon() -> bool:
+    # This is consulted while building the argument parser, when starting edenfs
+    # and when collecting rage output, and it cannot change while we are running.
     if sys.platform == "darwin":
         return "ARM64" in os.uname().version
     else:
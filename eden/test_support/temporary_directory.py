@@ -97,9 +97,15 @@ class TempFileManager:
 
     _temp_dir: Optional[Path] = None
     _prefix: Optional[str]
+    _parent_dir: Optional[str]
 
-    def __init__(self, prefix: Optional[str] = "eden_test.") -> None:
+    def __init__(
+        self, prefix: Optional[str] = "eden_test.", parent_dir: Optional[str] = None
+    ) -> None:
+        """If parent_dir is None the top-level directory is created in the default
+        location chosen by the tempfile module."""
         self._prefix = prefix
+        self._parent_dir = parent_dir
 
     def __enter__(self) -> "TempFileManager":
         return self
@@ -152,7 +158,9 @@ class TempFileManager:
     def top_level_tmp_dir(self) -> Path:
         top = self._temp_dir
         if top is None:
-            top = Path(tempfile.mkdtemp(prefix=self._prefix)).resolve()
+            top = Path(
+                tempfile.mkdtemp(prefix=self._prefix, dir=self._parent_dir)
+            ).resolve()
             self._temp_dir = top
 
         return top